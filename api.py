@@ -0,0 +1,145 @@
+import os
+import time
+from contextlib import asynccontextmanager
+
+import pandas as pd
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+
+from src.utils import load_artifacts
+from src.cache import PredictionCache
+from src.metrics import METRICS
+from src.microbatch import MicroBatcher
+from src.prediction import encode_row, encode_frame, predict_proba_batch, decode_predictions
+
+# ============================================
+# MODELS - loaded once per worker process
+# ============================================
+_start = time.perf_counter()
+MODELS = load_artifacts()
+METRICS.set_gauge("model_load_seconds", time.perf_counter() - _start)
+METRICS.register_gauges("engine", lambda: MODELS["engines"])
+CACHE = PredictionCache(maxsize=16384)
+METRICS.register_gauges("cache", CACHE.stats)
+
+# Concurrent /predict calls are scored together; tune with these env vars
+BATCHER = MicroBatcher(
+    lambda X: predict_proba_batch(X, MODELS),
+    max_batch=int(os.environ.get("ATTRITION_BATCH_MAX_SIZE", "64")),
+    max_wait=float(os.environ.get("ATTRITION_BATCH_MAX_WAIT_MS", "2")) / 1000,
+)
+METRICS.register_gauges("microbatch", BATCHER.stats)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    BATCHER.start()
+    yield
+    await BATCHER.stop()
+
+
+app = FastAPI(title="Employee Churn Prediction API", lifespan=lifespan)
+
+
+class Employee(BaseModel):
+    Age: int
+    Gender: str
+    MaritalStatus: str
+    Department: str
+    BusinessTravel: str
+    JobRole: str
+    JobLevel: int
+    Education: int
+    EducationField: str
+    OverTime: str
+    TotalWorkingYears: int
+    YearsAtCompany: int
+    YearsInCurrentRole: int
+    MonthlyIncome: float
+    DistanceFromHome: float
+    JobSatisfaction: int
+
+
+class Roster(BaseModel):
+    employees: list[Employee]
+
+
+def encode(employees):
+    """Validate against the input schema and encode; invalid rows are a 422 listing each one."""
+    validator = MODELS["validator"]
+    try:
+        if len(employees) == 1:
+            record = employees[0].model_dump()
+            errors = validator.check_record(record)
+            if errors:
+                raise HTTPException(status_code=422, detail=[{"row": 0, "errors": errors}])
+            return encode_row(record, MODELS).reshape(1, -1)
+        df = pd.DataFrame([e.model_dump() for e in employees])
+        errors = validator.check_frame(df)
+        if len(errors):
+            by_row = errors.groupby("row", sort=True)["message"].agg(list)
+            raise HTTPException(
+                status_code=422,
+                detail=[{"row": int(row), "errors": messages} for row, messages in by_row.items()],
+            )
+        return encode_frame(df, MODELS)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def score(employees):
+    with METRICS.span("api.encode"):
+        X = encode(employees)
+    with METRICS.span("api.forest"):
+        proba = predict_proba_batch(X, MODELS)
+    labels = decode_predictions(proba, MODELS)
+    return [
+        {"attrition": str(label), "probability": float(p[1])}
+        for label, p in zip(labels, proba)
+    ]
+
+
+# ============================================
+# ROUTES
+# ============================================
+@app.get("/health")
+def health():
+    return {"status": "ok"}
+
+
+@app.get("/stats")
+def stats():
+    return {
+        "model_version": MODELS["manifest"]["version"],
+        "cache": CACHE.stats(),
+        "microbatch": BATCHER.stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return METRICS.prometheus()
+
+
+@app.post("/predict")
+async def predict(employee: Employee):
+    with METRICS.span("api.encode"):
+        x = encode([employee])
+    version = MODELS["manifest"]["sha256"]
+    hit = CACHE.get(x, version)
+    if hit is not None:
+        pred, proba = hit
+    else:
+        with METRICS.span("api.predict"):
+            proba = await BATCHER.submit(x)
+        pred = MODELS["classes"][proba.argmax()]
+        CACHE.put(x, version, (pred, proba))
+    return {"attrition": str(MODELS["labels"][proba.argmax()]), "probability": float(proba[1])}
+
+
+@app.post("/predict/batch")
+def predict_batch(roster: Roster):
+    if not roster.employees:
+        return {"predictions": []}
+    return {"predictions": score(roster.employees)}
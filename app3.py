@@ -1,9 +1,12 @@
+import time
+_import_start = time.perf_counter()
 import streamlit as st
-import pickle
-import numpy as np
-import plotly.graph_objects as go
-from streamlit_lottie import st_lottie
-import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from src.lottie import resolve_lottie, read_lottie
+from src.metrics import METRICS
+# numpy/pandas/scikit-learn, plotly and streamlit_lottie are imported inside the
+# functions that need them so the home page renders before they are loaded
 
 # ============================================
 # 🎨 PAGE CONFIG & GLOBAL STYLE
@@ -457,43 +460,100 @@ section.main > div, div.block-container {
 """
 st.markdown(page_bg, unsafe_allow_html=True)
 
-# Load Lottie animations with double size
+# Load Lottie animations once per process (prefers the .min.json.gz variants)
+@st.cache_resource
 def load_lottie(path):
+    resolved = resolve_lottie(path)
+    if resolved is None:
+        return None
     try:
-        with open(path, "r") as f:
-            return json.load(f)
-    except:
+        return read_lottie(resolved)
+    except (OSError, ValueError):
         return None
 
+# Lite mode skips the animations: set ATTRITION_LITE_MODE=1 or open the app with ?lite=1
+def lite_mode():
+    return os.environ.get("ATTRITION_LITE_MODE") == "1" or st.query_params.get("lite") == "1"
+
 # ============================================
 # SESSION STATE
 # ============================================
 if "page" not in st.session_state:
     st.session_state.page = "home"
-if "prediction_result" not in st.session_state:
-    st.session_state.prediction_result = None
-if "prediction_proba" not in st.session_state:
-    st.session_state.prediction_proba = None
-if "emp_data" not in st.session_state:
-    st.session_state.emp_data = {}
+# Sessions hold only the ID of their latest result; the result itself lives
+# in the shared, bounded store from get_result_store()
+if "result_id" not in st.session_state:
+    st.session_state.result_id = None
+if "show_details" not in st.session_state:
+    st.session_state.show_details = False
 
 # ============================================
 # LOAD MODELS
 # ============================================
+# Import time of the first script run; the underscore keeps the argument out of
+# the cache key, so later reruns (which reuse the loaded modules) don't overwrite it
+@st.cache_resource
+def record_import_time(_seconds):
+    METRICS.set_gauge("startup_import_seconds", _seconds)
+
+record_import_time(time.perf_counter() - _import_start)
+
+def _load_artifacts():
+    from src.utils import load_artifacts
+    start = time.perf_counter()
+    models = load_artifacts()
+    METRICS.set_gauge("model_load_seconds", time.perf_counter() - start)
+    METRICS.register_gauges("engine", lambda: models["engines"])
+    return models
+
+# Loading starts in a background thread once the home page has rendered;
+# pages that need the model wait on the same future
 @st.cache_resource
+def model_future():
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-load")
+    future = executor.submit(_load_artifacts)
+    executor.shutdown(wait=False)
+    return future
+
 def load_models():
-    return {
-        "rf": pickle.load(open("rf.sav", "rb")),
-        "sc": pickle.load(open("sc.sav", "rb")),
-        "enc_attrition": pickle.load(open("enc_attrition.sav", "rb")),
-        "enc_businesstravel": pickle.load(open("enc_businesstravel.sav", "rb")),
-        "enc_department": pickle.load(open("enc_department.sav", "rb")),
-        "enc_educationfield": pickle.load(open("enc_educationfield.sav", "rb")),
-        "enc_gender": pickle.load(open("enc_gender.sav", "rb")),
-        "enc_jobrole": pickle.load(open("enc_jobrole.sav", "rb")),
-        "enc_maritalstatus": pickle.load(open("enc_maritalstatus.sav", "rb")),
-        "enc_overtime": pickle.load(open("enc_overtime.sav", "rb")),
-    }
+    future = model_future()
+    try:
+        return future.result()
+    except Exception:
+        model_future.clear()
+        raise
+
+# Shared by every session; cleared automatically when the model bundle changes
+@st.cache_resource
+def get_prediction_cache():
+    from src.cache import PredictionCache
+    cache = PredictionCache(maxsize=4096, ttl=3600)
+    METRICS.register_gauges("cache", cache.stats)
+    return cache
+
+# TreeSHAP tables are built once per process; explanations cached per feature vector
+@st.cache_resource
+def get_explainer():
+    from src.explain import TreeExplainer
+    return TreeExplainer.from_models(load_models())
+
+@st.cache_resource
+def get_explanation_cache():
+    from src.cache import PredictionCache
+    return PredictionCache(maxsize=1024)
+
+# Set ATTRITION_RESULT_DB to a SQLite path to share results between replicas
+@st.cache_resource
+def get_result_store():
+    from src.resultstore import ResultStore
+    store = ResultStore(maxsize=1024, path=os.environ.get("ATTRITION_RESULT_DB"))
+    METRICS.register_gauges("results", store.stats)
+    return store
+
+@st.cache_resource
+def get_risk_store():
+    from src.riskstore import RiskStore
+    return RiskStore()
 
 # ============================================
 # HOME PAGE - Updated with Lottie animation at top (0.75x size = 360px)
@@ -503,17 +563,19 @@ def home_page():
     st.markdown("### *Predict and Prevent Employee Attrition with AI-Powered Insights*")
 
     # Lottie Animation at the TOP below heading - Reduced to 0.75 of original (360px)
-    lottie_data = load_lottie("home.json")
-    if lottie_data:
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            # Transparent container for Lottie animation
-            st.markdown(
-                '<div style="background-color: transparent; border-radius: 15px; padding: 10px;">',
-                unsafe_allow_html=True,
-            )
-            st_lottie(lottie_data, height=360, key="home_lottie")
-            st.markdown("</div>", unsafe_allow_html=True)
+    with METRICS.span("home.lottie"):
+        lottie_data = None if lite_mode() else load_lottie("home.json")
+        if lottie_data:
+            from streamlit_lottie import st_lottie
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col2:
+                # Transparent container for Lottie animation
+                st.markdown(
+                    '<div style="background-color: transparent; border-radius: 15px; padding: 10px;">',
+                    unsafe_allow_html=True,
+                )
+                st_lottie(lottie_data, height=360, key="home_lottie")
+                st.markdown("</div>", unsafe_allow_html=True)
 
     st.markdown("<br>", unsafe_allow_html=True)
 
@@ -578,6 +640,12 @@ def home_page():
         if st.button("🔍 Start Prediction", use_container_width=True, key="home_start_button"):
             st.session_state.page = "input"
             st.rerun()
+        if st.button("📂 Batch Scoring", use_container_width=True, key="home_batch_button"):
+            st.session_state.page = "batch"
+            st.rerun()
+        if st.button("📊 Cohort Dashboard", use_container_width=True, key="home_cohort_button"):
+            st.session_state.page = "cohort"
+            st.rerun()
 
     # Home button (already on home page, just for consistency)
     st.markdown("---")
@@ -592,11 +660,15 @@ def home_page():
             unsafe_allow_html=True,
         )
 
+    # Page is on screen; start loading the model for the next one
+    model_future()
+
 
 # ============================================
 # INPUT PAGE - Fixed duplicate element ID error
 # ============================================
 def input_page():
+    from src.prediction import CATEGORICAL, NUMERIC_RANGES, encode_row, predict_one
     models = load_models()
     st.header("📝 Employee Information Entry")
     st.markdown("*Please provide accurate information for best prediction results*")
@@ -611,40 +683,48 @@ def input_page():
                           label_visibility="collapsed", 
                           key=f"select_{key_suffix}")
     
+    # Bounds and options come from the shared input spec in src/schema.py
+    def num(label, field, help, key):
+        lo, hi = NUMERIC_RANGES[field]
+        return st.number_input(label, lo, hi, lo, help=help, key=key)
+    
+    def choices(field):
+        if field in CATEGORICAL:
+            return models[CATEGORICAL[field]].classes_
+        lo, hi = NUMERIC_RANGES[field]
+        return list(range(lo, hi + 1))
+    
     with col1:
         st.markdown("### 👤 Personal Information")
-        age = st.number_input("Age", 18, 65, 18, help="Employee's current age", key="age_input")
-        gender = sel("Gender", models["enc_gender"].classes_, "gender")
-        marital = sel("Marital Status", models["enc_maritalstatus"].classes_, "marital")
-        dist = st.number_input("Distance From Home (km)", 0, 50, 0, 
-                              help="Distance from home to workplace in kilometers", key="dist_input")
+        age = num("Age", "Age", "Employee's current age", "age_input")
+        gender = sel("Gender", choices("Gender"), "gender")
+        marital = sel("Marital Status", choices("MaritalStatus"), "marital")
+        dist = num("Distance From Home (km)", "DistanceFromHome",
+                   "Distance from home to workplace in kilometers", "dist_input")
         
         st.markdown("### 💼 Work Experience")
-        total_years = st.number_input("Total Working Years", 0, 40, 0, 
-                                     help="Total years of professional experience", key="total_years_input")
-        yrs_comp = st.number_input("Years At Company", 0, 40, 0, 
-                                  help="Years with current company", key="yrs_comp_input")
-        yrs_role = st.number_input("Years in Current Role", 0, 20, 0, 
-                                  help="Years in current position", key="yrs_role_input")
+        total_years = num("Total Working Years", "TotalWorkingYears",
+                          "Total years of professional experience", "total_years_input")
+        yrs_comp = num("Years At Company", "YearsAtCompany", "Years with current company", "yrs_comp_input")
+        yrs_role = num("Years in Current Role", "YearsInCurrentRole", "Years in current position", "yrs_role_input")
         
         st.markdown("### 🎓 Education")
-        education = sel("Education Level (1-5)", [1, 2, 3, 4, 5], "education")
-        edu_field = sel("Education Field", models["enc_educationfield"].classes_, "edu_field")
+        education = sel("Education Level (1-5)", choices("Education"), "education")
+        edu_field = sel("Education Field", choices("EducationField"), "edu_field")
     
     with col2:
         st.markdown("### 🏢 Job Details")
-        dept = sel("Department", models["enc_department"].classes_, "dept")
-        job = sel("Job Role", models["enc_jobrole"].classes_, "job")
-        job_lvl = sel("Job Level (1-5)", [1, 2, 3, 4, 5], "job_lvl")
+        dept = sel("Department", choices("Department"), "dept")
+        job = sel("Job Role", choices("JobRole"), "job")
+        job_lvl = sel("Job Level (1-5)", choices("JobLevel"), "job_lvl")
         
         st.markdown("### 💰 Compensation & Work")
-        income = st.number_input("Monthly Income ($)", 0, 20000, 0, 
-                                help="Gross monthly income in USD", key="income_input")
-        travel = sel("Business Travel", models["enc_businesstravel"].classes_, "travel")
-        overtime = sel("OverTime", models["enc_overtime"].classes_, "overtime")
+        income = num("Monthly Income ($)", "MonthlyIncome", "Gross monthly income in USD", "income_input")
+        travel = sel("Business Travel", choices("BusinessTravel"), "travel")
+        overtime = sel("OverTime", choices("OverTime"), "overtime")
         
         st.markdown("### 😊 Job Satisfaction")
-        job_sat = sel("Job Satisfaction (1-4)", [1, 2, 3, 4], "job_sat")
+        job_sat = sel("Job Satisfaction (1-4)", choices("JobSatisfaction"), "job_sat")
     
     required = [gender, marital, dept, job, job_lvl, travel, overtime, edu_field, job_sat, education]
     
@@ -657,8 +737,8 @@ def input_page():
                 st.error("⚠️ Please fill all required fields.")
                 return
             
-            # Store employee data
-            st.session_state.emp_data = {
+            # Employee summary shown on the results page
+            emp_data = {
                 "Age": age,
                 "Gender": gender,
                 "Marital Status": marital,
@@ -677,31 +757,42 @@ def input_page():
                 "Job Satisfaction": f"{job_sat}/4"
             }
             
-            X = [
-                age,
-                models["enc_gender"].transform([gender])[0],
-                models["enc_maritalstatus"].transform([marital])[0],
-                models["enc_department"].transform([dept])[0],
-                models["enc_businesstravel"].transform([travel])[0],
-                models["enc_jobrole"].transform([job])[0],
-                int(job_lvl),
-                int(education),
-                models["enc_educationfield"].transform([edu_field])[0],
-                models["enc_overtime"].transform([overtime])[0],
-                total_years,
-                yrs_comp,
-                yrs_role,
-                income,
-                dist,
-                int(job_sat)
-            ]
+            record = {
+                "Age": age,
+                "Gender": gender,
+                "MaritalStatus": marital,
+                "Department": dept,
+                "BusinessTravel": travel,
+                "JobRole": job,
+                "JobLevel": int(job_lvl),
+                "Education": int(education),
+                "EducationField": edu_field,
+                "OverTime": overtime,
+                "TotalWorkingYears": total_years,
+                "YearsAtCompany": yrs_comp,
+                "YearsInCurrentRole": yrs_role,
+                "MonthlyIncome": income,
+                "DistanceFromHome": dist,
+                "JobSatisfaction": int(job_sat)
+            }
+            errors = models["validator"].check_record(record)
+            if errors:
+                st.error("⚠️ " + "; ".join(errors))
+                return
             
-            X_scaled = models["sc"].transform(np.array(X).reshape(1, -1))
-            pred = models["rf"].predict(X_scaled)[0]
-            proba = models["rf"].predict_proba(X_scaled)[0]
+            with METRICS.span("input.encode"):
+                X = encode_row(record, models)
             
-            st.session_state.prediction_result = pred
-            st.session_state.prediction_proba = proba
+            with METRICS.span("input.predict"):
+                pred, proba = predict_one(X, models, get_prediction_cache())
+            
+            st.session_state.result_id = get_result_store().put({
+                "features": X.tolist(),
+                "pred": int(pred),
+                "proba": proba.tolist(),
+                "emp_data": emp_data,
+            })
+            st.session_state.show_details = False
             st.session_state.page = "results"
             st.rerun()
     
@@ -713,13 +804,116 @@ def input_page():
             st.session_state.page = "home"
             st.rerun()
 
+# ============================================
+# RESULT FIGURES - Serialized once per distinct probability and shared by all sessions
+# ============================================
+# Plotly's default template carries styling for every trace type; keep its
+# layout part and only the trace defaults a figure uses, to shrink the payload
+@st.cache_resource
+def plotly_template(*trace_types):
+    import plotly.graph_objects as go
+    import plotly.io as pio
+    base = pio.templates[pio.templates.default]
+    return go.layout.Template(layout=base.layout, data={t: base.data[t] for t in trace_types})
+
+# Sessions share the immutable JSON spec, never a Figure; each render gets its own
+# Figure rebuilt without re-validating (about 0.5 ms, against 6 ms validated)
+def figure_from_spec(spec):
+    import json
+    import plotly.graph_objects as go
+    return go.Figure(json.loads(spec), _validate=False)
+
+# Probabilities are averages over 100 trees, so only a few hundred values ever occur
+@st.cache_resource(max_entries=512)
+def gauge_spec(risk):
+    return gauge_figure(risk).to_json()
+
+@st.cache_resource(max_entries=512)
+def bar_spec(stay, risk):
+    return bar_figure(stay, risk).to_json()
+
+def gauge_figure(risk):
+    import plotly.graph_objects as go
+    fig_gauge = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=risk,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        number={'suffix': "%", 'font': {'size': 40, 'color': '#F5F5DC'}},
+        gauge={
+            'axis': {'range': [0, 100], 'tickwidth': 2, 'tickcolor': "#F5F5DC"},
+            'bar': {'color': "#8B0000"},
+            'bgcolor': "rgba(0,0,0,0.3)",
+            'borderwidth': 2,
+            'bordercolor': "#F5F5DC",
+            'steps': [
+                {'range': [0, 30], 'color': '#90EE90'},
+                {'range': [30, 70], 'color': '#FFD700'},
+                {'range': [70, 100], 'color': '#FF6347'}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': risk
+            }
+        }
+    ))
+    fig_gauge.update_layout(
+        template=plotly_template("indicator"),
+        height=350,
+        margin=dict(l=20, r=20, t=20, b=20),
+        paper_bgcolor='rgba(0,0,0,0.5)',
+        font={'color': "#F5F5DC", 'size': 14}
+    )
+    return fig_gauge
+
+def bar_figure(stay, risk):
+    import plotly.graph_objects as go
+    fig_bar = go.Figure()
+    fig_bar.add_trace(go.Bar(
+        x=['Will Stay', 'Will Leave'],
+        y=[stay, risk],
+        text=[f'{stay:.1f}%', f'{risk:.1f}%'],
+        textposition='outside',
+        marker_color=['#4CAF50', '#F44336'],
+        textfont=dict(size=16, color='#F5F5DC', family='Arial Black'),
+        marker_line_color='#F5F5DC',
+        marker_line_width=2
+    ))
+    fig_bar.update_layout(
+        template=plotly_template("bar"),
+        height=350,
+        yaxis=dict(
+            title=dict(text="Probability (%)", font=dict(size=14, color='#F5F5DC')),
+            range=[0, 100],
+            tickfont=dict(size=12, color='#F5F5DC'),
+            gridcolor='rgba(245, 245, 220, 0.2)'
+        ),
+        xaxis=dict(
+            title=dict(text="Outcome", font=dict(size=14, color='#F5F5DC')),
+            tickfont=dict(size=12, color='#F5F5DC')
+        ),
+        margin=dict(l=20, r=20, t=40, b=20),
+        paper_bgcolor='rgba(0,0,0,0.5)',
+        plot_bgcolor='rgba(0,0,0,0.3)',
+        showlegend=False
+    )
+    return fig_bar
+
 # ============================================
 # RESULT PAGE - Updated with Lottie animation below risk box (0.75x size = 300px)
 # ============================================
 def results_page():
     st.markdown("# 📊 Prediction Results")
     
-    proba = st.session_state.prediction_proba
+    result = get_result_store().get(st.session_state.result_id) if st.session_state.result_id else None
+    if result is None:
+        st.warning("⚠️ This result is no longer available. Please enter the employee details again.")
+        if st.button("🔄 New Prediction", use_container_width=True, key="expired_new_pred_button"):
+            st.session_state.page = "input"
+            st.rerun()
+        return
+    proba = result["proba"]
+    features = result["features"]
     risk = proba[1] * 100
     stay = proba[0] * 100
     
@@ -751,16 +945,18 @@ def results_page():
     st.markdown("<br>", unsafe_allow_html=True)
     
     # Lottie Animation BELOW risk box - Reduced to 0.75 of original (300px)
-    lottie_data = load_lottie("result.json")
-    if lottie_data:
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            # Transparent container for Lottie animation
-            st.markdown("""
-            <div style="background-color: transparent; border-radius: 15px; padding: 10px;">
-            """, unsafe_allow_html=True)
-            st_lottie(lottie_data, height=300, key="results_lottie")
-            st.markdown("</div>", unsafe_allow_html=True)
+    with METRICS.span("results.lottie"):
+        lottie_data = None if lite_mode() else load_lottie("result.json")
+        if lottie_data:
+            from streamlit_lottie import st_lottie
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col2:
+                # Transparent container for Lottie animation
+                st.markdown("""
+                <div style="background-color: transparent; border-radius: 15px; padding: 10px;">
+                """, unsafe_allow_html=True)
+                st_lottie(lottie_data, height=300, key="results_lottie")
+                st.markdown("</div>", unsafe_allow_html=True)
     
     st.markdown("<br>", unsafe_allow_html=True)
     
@@ -769,67 +965,14 @@ def results_page():
     
     with col1:
         st.markdown("### Attrition Risk Score")
-        fig_gauge = go.Figure(go.Indicator(
-            mode="gauge+number",
-            value=risk,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            number={'suffix': "%", 'font': {'size': 40, 'color': '#F5F5DC'}},
-            gauge={
-                'axis': {'range': [0, 100], 'tickwidth': 2, 'tickcolor': "#F5F5DC"},
-                'bar': {'color': "#8B0000"},
-                'bgcolor': "rgba(0,0,0,0.3)",
-                'borderwidth': 2,
-                'bordercolor': "#F5F5DC",
-                'steps': [
-                    {'range': [0, 30], 'color': '#90EE90'},
-                    {'range': [30, 70], 'color': '#FFD700'},
-                    {'range': [70, 100], 'color': '#FF6347'}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': risk
-                }
-            }
-        ))
-        fig_gauge.update_layout(
-            height=350,
-            margin=dict(l=20, r=20, t=20, b=20),
-            paper_bgcolor='rgba(0,0,0,0.5)',
-            font={'color': "#F5F5DC", 'size': 14}
-        )
+        with METRICS.span("results.gauge_figure"):
+            fig_gauge = figure_from_spec(gauge_spec(round(float(risk), 1)))
         st.plotly_chart(fig_gauge, use_container_width=True)
     
     with col2:
         st.markdown("### Prediction Probabilities")
-        fig_bar = go.Figure()
-        fig_bar.add_trace(go.Bar(
-            x=['Will Stay', 'Will Leave'],
-            y=[stay, risk],
-            text=[f'{stay:.1f}%', f'{risk:.1f}%'],
-            textposition='outside',
-            marker_color=['#4CAF50', '#F44336'],
-            textfont=dict(size=16, color='#F5F5DC', family='Arial Black'),
-            marker_line_color='#F5F5DC',
-            marker_line_width=2
-        ))
-        fig_bar.update_layout(
-            height=350,
-            yaxis=dict(
-                title=dict(text="Probability (%)", font=dict(size=14, color='#F5F5DC')),
-                range=[0, 100],
-                tickfont=dict(size=12, color='#F5F5DC'),
-                gridcolor='rgba(245, 245, 220, 0.2)'
-            ),
-            xaxis=dict(
-                title=dict(text="Outcome", font=dict(size=14, color='#F5F5DC')),
-                tickfont=dict(size=12, color='#F5F5DC')
-            ),
-            margin=dict(l=20, r=20, t=40, b=20),
-            paper_bgcolor='rgba(0,0,0,0.5)',
-            plot_bgcolor='rgba(0,0,0,0.3)',
-            showlegend=False
-        )
+        with METRICS.span("results.bar_figure"):
+            fig_bar = figure_from_spec(bar_spec(round(float(stay), 1), round(float(risk), 1)))
         st.plotly_chart(fig_bar, use_container_width=True)
     
     st.markdown("<br>", unsafe_allow_html=True)
@@ -837,7 +980,7 @@ def results_page():
     # Employee Summary
     st.markdown("## 📋 Employee Summary")
     
-    emp_data = st.session_state.emp_data
+    emp_data = result["emp_data"]
     
     col1, col2, col3 = st.columns(3)
     
@@ -888,22 +1031,287 @@ def results_page():
             st.rerun()
     with col2:
         if st.button("📊 View Details", use_container_width=True, key="view_details_button"):
-            # This could be expanded to show more detailed analysis
-            st.info("Detailed analysis feature coming soon!")
+            st.session_state.show_details = not st.session_state.show_details
     with col3:
         if st.button("🏠 Go to Home", use_container_width=True, key="results_home_button"):
             st.session_state.page = "home"
             st.rerun()
 
+    if st.session_state.show_details:
+        details_section(features)
+
+    whatif_section(features)
+
+    stats = get_prediction_cache().stats()
+    st.caption(
+        f"Prediction cache: {stats['hits']} hits / {stats['misses']} misses "
+        f"({stats['hit_rate']:.0%} hit rate, {stats['size']}/{stats['maxsize']} entries)"
+    )
+
+# ============================================
+# DETAILS - Feature contributions for the employee on the results page
+# ============================================
+def details_section(features):
+    import numpy as np
+    import plotly.graph_objects as go
+    from src.explain import explain_one
+    from src.prediction import FEATURES
+    models = load_models()
+    if models["rf"] is None:
+        st.info("Feature contributions are not available while the model runs in compact mode.")
+        return
+    explainer = get_explainer()
+    with METRICS.span("results.explain"):
+        phi = explain_one(np.asarray(features), models, explainer, get_explanation_cache())
+
+    st.markdown("## 🔍 What Drives This Prediction")
+    st.markdown(
+        f"*Contribution of each input to the attrition probability, relative to the "
+        f"average employee ({explainer.expected_value * 100:.1f}%)*"
+    )
+    order = np.argsort(np.abs(phi))
+    fig_contrib = go.Figure(go.Bar(
+        x=phi[order] * 100,
+        y=[FEATURES[i] for i in order],
+        orientation='h',
+        text=[f'{v * 100:+.1f} pts' for v in phi[order]],
+        textposition='outside',
+        marker_color=['#F44336' if v > 0 else '#4CAF50' for v in phi[order]],
+        textfont=dict(size=12, color='#F5F5DC'),
+    ))
+    fig_contrib.update_layout(
+        template=plotly_template("bar"),
+        height=520,
+        xaxis=dict(
+            title=dict(text="Change in attrition probability (pts)", font=dict(size=14, color='#F5F5DC')),
+            tickfont=dict(size=12, color='#F5F5DC'),
+            gridcolor='rgba(245, 245, 220, 0.2)'
+        ),
+        yaxis=dict(tickfont=dict(size=12, color='#F5F5DC')),
+        margin=dict(l=20, r=60, t=20, b=20),
+        paper_bgcolor='rgba(0,0,0,0.5)',
+        plot_bgcolor='rgba(0,0,0,0.3)',
+        showlegend=False
+    )
+    st.plotly_chart(fig_contrib, use_container_width=True)
+
+# ============================================
+# WHAT-IF - Probability response to one or two inputs, scored as one grid
+# ============================================
+def whatif_section(features):
+    import numpy as np
+    import plotly.graph_objects as go
+    from src.prediction import FEATURES
+    from src.whatif import WHATIF_FEATURES, sweep
+    st.markdown("## 🔀 What-If Analysis")
+    st.markdown("*See how the attrition probability would change if these inputs were different*")
+    chosen = st.multiselect(
+        "Inputs to vary (pick one or two)", WHATIF_FEATURES,
+        default=["MonthlyIncome"], max_selections=2, key="whatif_features",
+    )
+    if not chosen:
+        return
+
+    models = load_models()
+    with METRICS.span("results.whatif"):
+        axes, labels, risk = sweep(np.asarray(features), chosen, models)
+
+    layout = dict(
+        height=420,
+        margin=dict(l=20, r=20, t=20, b=20),
+        paper_bgcolor='rgba(0,0,0,0.5)',
+        plot_bgcolor='rgba(0,0,0,0.3)',
+        font={'color': "#F5F5DC", 'size': 14},
+    )
+    if len(chosen) == 1:
+        feature = chosen[0]
+        current = features[FEATURES.index(feature)]
+        current_index = int(np.abs(axes[feature] - current).argmin())
+        fig_whatif = go.Figure()
+        fig_whatif.add_trace(go.Scatter(
+            x=labels[feature], y=risk * 100, mode='lines+markers',
+            line=dict(color='#D2B48C', width=3), name='Attrition probability'
+        ))
+        fig_whatif.add_trace(go.Scatter(
+            x=[labels[feature][current_index]], y=[risk[current_index] * 100], mode='markers',
+            marker=dict(color='#F44336', size=14, line=dict(color='#F5F5DC', width=2)), name='Current'
+        ))
+        fig_whatif.update_layout(
+            template=plotly_template("scatter"),
+            xaxis=dict(title=dict(text=feature), gridcolor='rgba(245, 245, 220, 0.2)'),
+            yaxis=dict(title=dict(text="Attrition probability (%)"), range=[0, 100],
+                       gridcolor='rgba(245, 245, 220, 0.2)'),
+            showlegend=False, **layout
+        )
+    else:
+        rows, cols = chosen
+        fig_whatif = go.Figure(go.Heatmap(
+            z=risk * 100, x=labels[cols], y=labels[rows], zmin=0, zmax=100,
+            colorscale=[[0, '#90EE90'], [0.5, '#FFD700'], [1, '#FF6347']],
+            colorbar=dict(title=dict(text="%")),
+        ))
+        fig_whatif.update_layout(
+            template=plotly_template("heatmap"),
+            xaxis=dict(title=dict(text=cols)), yaxis=dict(title=dict(text=rows)), **layout
+        )
+    st.plotly_chart(fig_whatif, use_container_width=True)
+
+# ============================================
+# BATCH PAGE - Score a whole roster from a CSV/Parquet upload
+# ============================================
+# Keyed on the uploaded bytes and model checksum, so the reruns triggered by
+# the download and save buttons reuse the scored roster instead of rescoring
+@st.cache_data(max_entries=4, show_spinner="Scoring roster...")
+def score_upload(data, filename, model_sha256):
+    from src.prediction import read_roster, score_frame
+    scored = score_frame(read_roster(data, filename), load_models())
+    return scored, scored.to_csv(index=False).encode("utf-8")
+
+def batch_page():
+    from src.prediction import FEATURES
+    models = load_models()
+    st.header("📂 Batch Attrition Scoring")
+    st.markdown("*Upload an employee roster to score every employee in one pass*")
+    st.markdown(f"Required columns: `{'`, `'.join(FEATURES)}`")
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    uploaded = st.file_uploader("Employee roster", type=["csv", "parquet"], key="batch_upload")
+    if uploaded is not None:
+        try:
+            scored, scored_csv = score_upload(uploaded.getvalue(), uploaded.name,
+                                              models["manifest"]["sha256"])
+        except ValueError as e:
+            st.error(f"⚠️ Could not score roster: {e}")
+        else:
+            high = int((scored["AttritionProbability"] >= 0.7).sum())
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Employees Scored", f"{len(scored):,}")
+            col2.metric("Predicted Leavers", f"{int((scored['Attrition'] == 'Yes').sum()):,}")
+            col3.metric("High Risk (≥70%)", f"{high:,}")
+
+            st.dataframe(scored.head(100), use_container_width=True)
+            st.download_button(
+                "⬇️ Download Scored Roster",
+                scored_csv,
+                file_name="scored_roster.csv",
+                mime="text/csv",
+                use_container_width=True,
+                key="batch_download_button",
+            )
+            # Index rows are keyed on the employee ID, so rosters without one can't be saved
+            from src.riskstore import DEFAULT_ID_COLUMN
+            if DEFAULT_ID_COLUMN not in scored.columns:
+                st.info(f"Add an `{DEFAULT_ID_COLUMN}` column to the roster to save it to the risk index.")
+            elif st.button("💾 Save to Risk Index", use_container_width=True, key="batch_index_button"):
+                n = get_risk_store().add(scored, models["manifest"]["sha256"])
+                st.success(f"Indexed {n:,} employees in {get_risk_store().path}")
+
+    # Home button at bottom
+    st.markdown("---")
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col2:
+        if st.button("🏠 Go to Home", use_container_width=True, key="batch_home_button"):
+            st.session_state.page = "home"
+            st.rerun()
+
+# ============================================
+# COHORT PAGE - Risk by cohort from the risk index rollups, no rescoring
+# ============================================
+def cohort_page():
+    import plotly.graph_objects as go
+    from src.riskstore import BIN_COLUMNS, DIMENSIONS, HIGH_RISK, HIST_BINS
+    store = get_risk_store()
+    st.header("📊 Cohort Risk Dashboard")
+    st.markdown("*Attrition risk across every employee saved to the risk index*")
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    overall = store.rollup()
+    if overall.empty:
+        st.info("The risk index is empty. Score a roster on the Batch Scoring page and save it to the index.")
+    else:
+        total = overall.iloc[0]
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Employees Scored", f"{int(total['employees']):,}")
+        col2.metric("Mean Attrition Risk", f"{total['mean_risk'] * 100:.1f}%")
+        col3.metric(f"High Risk (≥{HIGH_RISK:.0%})", f"{int(total['high_risk']):,}")
+
+        by = st.selectbox("Break down by", DIMENSIONS, index=DIMENSIONS.index("Department"),
+                          key="cohort_dimension")
+        cohorts = store.rollup(by)
+        layout = dict(
+            margin=dict(l=20, r=20, t=20, b=20),
+            paper_bgcolor='rgba(0,0,0,0.5)',
+            plot_bgcolor='rgba(0,0,0,0.3)',
+            font={'color': "#F5F5DC", 'size': 14},
+        )
+
+        fig_mean = go.Figure(go.Bar(
+            x=cohorts[by], y=cohorts["mean_risk"] * 100,
+            text=[f"{r * 100:.1f}%" for r in cohorts["mean_risk"]], textposition='outside',
+            marker_color='#D2B48C', marker_line_color='#F5F5DC', marker_line_width=2,
+        ))
+        fig_mean.update_layout(
+            template=plotly_template("bar"), height=380,
+            yaxis=dict(title=dict(text="Mean attrition probability (%)"), range=[0, 100],
+                       gridcolor='rgba(245, 245, 220, 0.2)'),
+            xaxis=dict(title=dict(text=by)), showlegend=False, **layout
+        )
+        st.plotly_chart(fig_mean, use_container_width=True)
+
+        # Share of each cohort in every probability band
+        width = 100 // HIST_BINS
+        bands = [f"{i * width}-{(i + 1) * width}%" for i in range(HIST_BINS)]
+        shares = cohorts[BIN_COLUMNS].to_numpy() / cohorts[["employees"]].to_numpy() * 100
+        fig_dist = go.Figure(go.Heatmap(
+            z=shares, x=bands, y=cohorts[by], zmin=0,
+            colorscale=[[0, '#90EE90'], [0.5, '#FFD700'], [1, '#FF6347']],
+            colorbar=dict(title=dict(text="% of cohort")),
+        ))
+        fig_dist.update_layout(
+            template=plotly_template("heatmap"), height=120 + 40 * len(cohorts),
+            xaxis=dict(title=dict(text="Attrition probability")), yaxis=dict(title=dict(text=by)),
+            **layout
+        )
+        st.plotly_chart(fig_dist, use_container_width=True)
+
+        table = cohorts[[by, "employees", "mean_risk", "high_risk"]].rename(columns={
+            "employees": "Employees", "mean_risk": "Mean Risk", "high_risk": "High Risk",
+        })
+        st.dataframe(table, use_container_width=True, hide_index=True)
+
+    # Home button at bottom
+    st.markdown("---")
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col2:
+        if st.button("🏠 Go to Home", use_container_width=True, key="cohort_home_button"):
+            st.session_state.page = "home"
+            st.rerun()
+
+# ============================================
+# STATS PAGE - Stage timings and cache counters (open with ?page=stats)
+# ============================================
+def stats_page():
+    get_prediction_cache()
+    st.header("📈 Performance Stats")
+    if not METRICS.enabled:
+        st.info("Metrics are disabled (ATTRITION_METRICS=0).")
+    st.json(METRICS.snapshot())
+
 # ============================================
 # MAIN
 # ============================================
 def main():
-    if st.session_state.page == "home":
+    if st.query_params.get("page") == "stats":
+        stats_page()
+    elif st.session_state.page == "home":
         home_page()
     elif st.session_state.page == "input":
         input_page()
     elif st.session_state.page == "results":
         results_page()
+    elif st.session_state.page == "batch":
+        batch_page()
+    elif st.session_state.page == "cohort":
+        cohort_page()
 
 main()
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""Benchmark the end-to-end prediction path.
+
+Usage: python -m src.benchmark [--out bench.json] [--compare previous.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import sklearn
+
+from src.utils import load_artifacts
+from src.prediction import (
+    encode_frame,
+    encode_row,
+    forest_proba,
+    predict_one,
+    predict_proba_batch,
+    synthetic_roster,
+)
+
+BATCH_SIZES = [1, 100, 10_000, 1_000_000]
+
+# Run from the repository root so `src` imports; the artifacts directory is passed in
+COLD_START = (
+    "import time; t = time.perf_counter(); "
+    "from src.utils import load_artifacts; load_artifacts({base_dir!r}); "
+    "print(time.perf_counter() - t)"
+)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentiles(samples):
+    ms = np.asarray(samples) * 1000
+    return {
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+    }
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def bench_cold_start(base_dir, repeats):
+    """Time imports plus load_artifacts() in fresh interpreter processes."""
+    samples = []
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", COLD_START.format(base_dir=os.path.abspath(base_dir))],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return {"runs": repeats, "mean_s": float(np.mean(samples)), "min_s": float(np.min(samples))}
+
+
+def bench_single_row(models, n_rows):
+    """Per-stage and end-to-end latency for one employee at a time (no cache)."""
+    records = synthetic_roster(n_rows, models, seed=1).to_dict("records")
+    stages = {"encode": [], "scale": [], "forest": [], "end_to_end": []}
+    for record in records:
+        x = encode_row(record, models).reshape(1, -1)
+        stages["encode"].append(timed(encode_row, record, models))
+        stages["scale"].append(timed(models["sc"].transform, x))
+        stages["forest"].append(timed(forest_proba, x, models))
+        start = time.perf_counter()
+        predict_one(encode_row(record, models), models)
+        stages["end_to_end"].append(time.perf_counter() - start)
+    return {name: percentiles(samples) for name, samples in stages.items()}
+
+
+def bench_batches(models, sizes):
+    results = {}
+    for n in sizes:
+        roster = synthetic_roster(n, models, seed=2)
+        start = time.perf_counter()
+        X = encode_frame(roster, models)
+        encoded = time.perf_counter()
+        predict_proba_batch(X, models)
+        scored = time.perf_counter()
+        results[str(n)] = {
+            "encode_s": encoded - start,
+            "score_s": scored - encoded,
+            "total_s": scored - start,
+            "rows_per_s": n / (scored - start),
+        }
+    return results
+
+
+def run(base_dir=".", sizes=BATCH_SIZES, single_rows=1000, cold_runs=3):
+    start = time.perf_counter()
+    models = load_artifacts(base_dir)
+    warm_load = time.perf_counter() - start
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "sklearn": sklearn.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+        },
+        "model_version": models["manifest"]["version"],
+        "engines": {
+            "flat": models.get("flat") is not None,
+            "fused_rf": models.get("fused_rf") is not None,
+            "compact": models.get("rf") is None,
+        },
+        "cold_start": bench_cold_start(base_dir, cold_runs),
+        "warm_load_s": warm_load,
+        "single_row": bench_single_row(models, single_rows),
+        "batch": bench_batches(models, sizes),
+    }
+
+
+def compare(current, previous, tolerance):
+    """Print per-metric ratios and return the metrics slower than tolerance allows."""
+    rows = [("cold_start.mean_s", current["cold_start"]["mean_s"], previous["cold_start"]["mean_s"])]
+    for stage, stats in current["single_row"].items():
+        rows.append((f"single_row.{stage}.p95_ms", stats["p95_ms"], previous["single_row"][stage]["p95_ms"]))
+    for n, stats in current["batch"].items():
+        if n in previous["batch"]:
+            rows.append((f"batch.{n}.total_s", stats["total_s"], previous["batch"][n]["total_s"]))
+
+    regressions = []
+    for name, now, before in rows:
+        ratio = now / before if before else float("inf")
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:40s} {before:12.4f} -> {now:12.4f}  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", default=".", help="directory holding the model artifacts")
+    parser.add_argument("--out", default="bench_results.json", help="where to write the JSON results")
+    parser.add_argument("--sizes", type=int, nargs="+", default=BATCH_SIZES, help="batch sizes to time")
+    parser.add_argument("--single-rows", type=int, default=1000, help="rows timed one at a time")
+    parser.add_argument("--cold-runs", type=int, default=3, help="fresh processes for cold start")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before flagging")
+    args = parser.parse_args()
+
+    results = run(args.dir, args.sizes, args.single_rows, args.cold_runs)
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"Cold start: {results['cold_start']['mean_s']:.3f} s")
+    for stage, stats in results["single_row"].items():
+        print(f"{stage:12s} p50 {stats['p50_ms']:.3f} ms  p95 {stats['p95_ms']:.3f} ms  p99 {stats['p99_ms']:.3f} ms")
+    for n, stats in results["batch"].items():
+        print(f"batch {int(n):>9,d}: {stats['total_s']:.3f} s ({stats['rows_per_s']:,.0f} rows/s)")
+    print(f"Wrote {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        if compare(results, previous, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Fuse the .sav artifacts into a single versioned bundle.
+
+Usage: python -m src.bundle [--version VERSION] [--dir DIR]
+"""
+import argparse
+import json
+import os
+import pickle
+from datetime import datetime, timezone
+
+import sklearn
+
+from src.utils import (
+    BUNDLE_FILE,
+    BUNDLE_FORMAT,
+    MANIFEST_FILE,
+    MODEL_FILES,
+    file_sha256,
+    load_sav_files,
+)
+
+
+def build_bundle(base_dir=".", version=None):
+    """Write model_bundle.pkl and its manifest next to the .sav files."""
+    models = load_sav_files(base_dir)
+    del models["manifest"]
+
+    created = datetime.now(timezone.utc)
+    bundle_path = os.path.join(base_dir, BUNDLE_FILE)
+    with open(bundle_path, "wb") as f:
+        pickle.dump(models, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "version": version or created.strftime("%Y%m%d%H%M%S"),
+        "created": created.isoformat(),
+        "sklearn": sklearn.__version__,
+        "sha256": file_sha256(bundle_path),
+        "size": os.path.getsize(bundle_path),
+        "artifacts": {
+            key: {"file": name, "sha256": file_sha256(os.path.join(base_dir, name))}
+            for key, name in MODEL_FILES.items()
+        },
+    }
+    with open(os.path.join(base_dir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", default=".", help="directory holding the .sav files")
+    parser.add_argument("--version", help="bundle version label (default: UTC timestamp)")
+    args = parser.parse_args()
+
+    manifest = build_bundle(args.dir, args.version)
+    print(f"Wrote {BUNDLE_FILE} version {manifest['version']} ({manifest['size']:,} bytes, sha256 {manifest['sha256'][:12]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class PredictionCache:
+    """In-process LRU cache of results keyed on the encoded feature vector.
+
+    Predictions store (pred, proba); explanations store their contributions.
+
+    Entries are tied to a model version (the bundle checksum); looking up with
+    a different version clears the cache. `ttl` is in seconds, None for no expiry.
+    """
+
+    def __init__(self, maxsize=4096, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._version = None
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(X):
+        row = np.ascontiguousarray(X, dtype=np.float64)
+        return hashlib.blake2b(row.tobytes(), digest_size=16).digest()
+
+    def _check_version(self, version):
+        if version != self._version:
+            self._data.clear()
+            self._version = version
+
+    def get(self, X, version):
+        key = self.key(X)
+        with self._lock:
+            self._check_version(version)
+            entry = self._data.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._data[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, X, version, value):
+        key = self.key(X)
+        with self._lock:
+            self._check_version(version)
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
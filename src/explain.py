@@ -0,0 +1,196 @@
+"""Per-employee feature contributions computed directly from the forest.
+
+Usage: python -m src.explain roster.csv contributions.csv
+"""
+import argparse
+from math import factorial
+
+import numpy as np
+import pandas as pd
+
+from src.prediction import FEATURES, encode_frame
+from src.utils import load_artifacts
+
+# Rows explained per vectorized pass; bounds the (rows x leaves x depth) arrays
+DEFAULT_EXPLAIN_CHUNK = 4
+
+
+class PathGroup:
+    """Leaf paths that share the same number d of unique features."""
+
+    def __init__(self, paths, d):
+        n = len(paths)
+        self.d = d
+        self.feature = np.zeros((n, d), dtype=np.int64)
+        self.lo = np.empty((n, d))
+        self.hi = np.empty((n, d))
+        self.zero = np.empty((n, d))
+        self.value = np.empty(n)
+        for i, (path, value) in enumerate(paths):
+            for j, (f, (lo, hi, z)) in enumerate(path.items()):
+                self.feature[i, j] = f
+                self.lo[i, j], self.hi[i, j], self.zero[i, j] = lo, hi, z
+            self.value[i] = value
+        # Shapley weight |S|! (d - |S| - 1)! / d! for each subset size |S| = k
+        self.weights = np.array([factorial(k) * factorial(d - k - 1) / factorial(d) for k in range(d)])
+
+    def contributions(self, X):
+        """Per-(row, leaf, path position) contributions, shape (rows, leaves, d)."""
+        d, zero = self.d, self.zero
+        xs = X[:, self.feature]
+        one = ((xs > self.lo) & (xs <= self.hi)).astype(np.float64)
+
+        # Q(t) = prod_j (z_j + o_j t), coefficients lowest degree first
+        poly = np.zeros(one.shape[:2] + (d + 1,))
+        poly[..., 0] = 1.0
+        for p in range(d):
+            shifted = poly[..., :-1] * one[..., p, None]
+            poly *= zero[:, p, None]
+            poly[..., 1:] += shifted
+
+        # Unwind (z_p + t) for every position p at once, from the top coefficient down
+        q = np.repeat(poly[..., d, None], d, axis=2)
+        total = self.weights[d - 1] * q
+        for k in range(d - 1, 0, -1):
+            q = poly[..., k, None] - zero * q
+            total += self.weights[k - 1] * q
+        # A constant factor z_p (o_p = 0) divides out directly
+        constant = (poly[..., :d] @ self.weights)[..., None] / zero
+        total = np.where(one > 0, total, constant)
+        return self.value[:, None] * (one - zero) * total
+
+
+class TreeExplainer:
+    """Exact path-dependent TreeSHAP contributions for a random forest.
+
+    Every root-to-leaf path is reduced once, at construction, to its unique
+    features with the interval (lo, hi] each must fall in and the fraction of
+    training cover that follows the path ("zero fraction"). For a row x the
+    path's Shapley weights come from the coefficients of
+        Q(t) = prod_j (z_j + o_j(x) t),   o_j(x) = lo_j < x_j <= hi_j,
+    and feature j's share from dividing its factor back out of Q, the same
+    "unwind" step as TreeSHAP. Leaves of all trees are grouped by path length
+    and each group is processed as one array.
+    """
+
+    def __init__(self, rf, n_features, scaled_input=True, class_index=1):
+        self.n_features = n_features
+        self.scaled_input = scaled_input
+        self.n_trees = len(rf.estimators_)
+
+        paths = []
+        for est in rf.estimators_:
+            paths.extend(self._leaf_paths(est.tree_, class_index))
+
+        by_size = {}
+        for path, value in paths:
+            by_size.setdefault(len(path), []).append((path, value))
+        self.groups = [PathGroup(group, d) for d, group in sorted(by_size.items()) if d > 0]
+
+        # A path with no splits (single-leaf tree) only adds to the expected value
+        expected = sum(value for path, value in by_size.get(0, []))
+        for group in self.groups:
+            expected += float((group.zero.prod(axis=1) * group.value).sum())
+        self.expected_value = expected / self.n_trees
+
+    @classmethod
+    def from_models(cls, models):
+        """Explain the fused forest when available so raw encoded rows can be passed."""
+        if models.get("rf") is None:
+            raise ValueError("Explanations need the full forest; load the models without compact mode")
+        fused = models.get("fused_rf")
+        if fused is not None:
+            return cls(fused, fused.n_features_in_, scaled_input=False)
+        return cls(models["rf"], models["rf"].n_features_in_, scaled_input=True)
+
+    @staticmethod
+    def _leaf_paths(tree, class_index):
+        value = tree.value[:, 0, :]
+        proba = value[:, class_index] / value.sum(axis=1)
+        cover = tree.weighted_n_node_samples
+        left, right = tree.children_left, tree.children_right
+
+        leaves = []
+        stack = [(0, {})]
+        while stack:
+            node, path = stack.pop()
+            if left[node] == -1:
+                leaves.append((path, proba[node]))
+                continue
+            f, t = int(tree.feature[node]), tree.threshold[node]
+            for child, goes_left in ((left[node], True), (right[node], False)):
+                lo, hi, z = path.get(f, (-np.inf, np.inf, 1.0))
+                if goes_left:
+                    hi = min(hi, t)
+                else:
+                    lo = max(lo, t)
+                child_path = dict(path)
+                child_path[f] = (lo, hi, z * cover[child] / cover[node])
+                stack.append((child, child_path))
+        return leaves
+
+    def _explain_chunk(self, X):
+        # Trees compare float32 inputs, so the path tests must too
+        X = np.asarray(X, dtype=np.float32)
+        phi = np.zeros((X.shape[0], self.n_features))
+        for group in self.groups:
+            contrib = group.contributions(X)
+            features = group.feature.ravel()
+            for r in range(X.shape[0]):
+                phi[r] += np.bincount(features, weights=contrib[r].ravel(), minlength=self.n_features)
+        return phi / self.n_trees
+
+    def shap_values(self, X, chunk_size=DEFAULT_EXPLAIN_CHUNK):
+        """Per-feature contributions to P(class); rows sum to proba - expected_value."""
+        X = np.atleast_2d(X)
+        phi = np.empty((X.shape[0], self.n_features))
+        for start in range(0, X.shape[0], chunk_size):
+            phi[start:start + chunk_size] = self._explain_chunk(X[start:start + chunk_size])
+        return phi
+
+
+def explain_rows(X, models, explainer, chunk_size=DEFAULT_EXPLAIN_CHUNK):
+    """Contributions for encoded (unscaled) rows, shape (n, 16)."""
+    X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+    if explainer.scaled_input:
+        X = models["sc"].transform(X)
+    return explainer.shap_values(X, chunk_size)
+
+
+def explain_one(x, models, explainer, cache=None):
+    """Contributions for one encoded feature vector, cached per vector and model version."""
+    x = np.asarray(x, dtype=np.float64).reshape(1, -1)
+    version = models["manifest"]["sha256"]
+    if cache is not None:
+        hit = cache.get(x, version)
+        if hit is not None:
+            return hit
+    phi = explain_rows(x, models, explainer)[0]
+    if cache is not None:
+        cache.put(x, version, phi)
+    return phi
+
+
+def explain_frame(df, models, explainer, chunk_size=DEFAULT_EXPLAIN_CHUNK):
+    """Contributions for a whole roster as a DataFrame with one column per feature."""
+    phi = explain_rows(encode_frame(df, models), models, explainer, chunk_size)
+    return pd.DataFrame(phi, columns=FEATURES, index=df.index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("roster", help="input CSV roster")
+    parser.add_argument("output", help="where to write the contributions CSV")
+    args = parser.parse_args()
+
+    models = load_artifacts()
+    explainer = TreeExplainer.from_models(models)
+    roster = pd.read_csv(args.roster)
+    contributions = explain_frame(roster, models, explainer)
+    contributions.insert(0, "ExpectedValue", explainer.expected_value)
+    contributions.to_csv(args.output, index=False)
+    print(f"Explained {len(contributions):,} employees -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+import copy
+
+import numpy as np
+
+# Rows evaluated per traversal step; bounds the (rows x trees) index matrix
+DEFAULT_CHUNK_SIZE = 4096
+
+# Above this many rows sklearn's compiled traversal overtakes the NumPy one
+FLAT_MAX_ROWS = 512
+
+
+class FlatForest:
+    """A fitted random forest flattened into contiguous node arrays.
+
+    All trees share one set of arrays; `roots` holds each tree's root offset.
+    Leaves point to themselves, so every row can be stepped `max_depth` times
+    across all trees at once without branching per tree.
+    """
+
+    # Node arrays, in the order they are shared or serialized
+    ARRAYS = ("feature", "threshold", "children", "value", "roots")
+
+    def __init__(self, feature, threshold, children, value, roots, max_depth, classes,
+                 scaled_input=True):
+        self.feature = feature
+        self.threshold = threshold
+        # Interleaved [left, right] pairs so a step is one gather: 2*idx + go_right
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.classes_ = classes
+        # False when the scaler has been folded into the thresholds
+        self.scaled_input = scaled_input
+
+    @classmethod
+    def from_sklearn(cls, rf, scaled_input=True):
+        if rf.n_outputs_ != 1:
+            raise ValueError("Only single-output forests can be flattened")
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        for est in rf.estimators_:
+            tree = est.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            own = np.arange(offset, offset + n, dtype=np.int64)
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, own, tree.children_left + offset))
+            rights.append(np.where(is_leaf, own, tree.children_right + offset))
+            value = tree.value[:, 0, :]
+            values.append(value / value.sum(axis=1, keepdims=True))
+            roots.append(offset)
+            offset += n
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features), dtype=np.int64),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+            children=np.stack([np.concatenate(lefts), np.concatenate(rights)], axis=1).ravel().astype(np.int64),
+            value=np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.int64),
+            max_depth=max(est.tree_.max_depth for est in rf.estimators_),
+            classes=rf.classes_,
+            scaled_input=scaled_input,
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def left(self):
+        return self.children[0::2]
+
+    @property
+    def right(self):
+        return self.children[1::2]
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in self.ARRAYS)
+
+    def compact(self, value_dtype=np.float32):
+        """Copy with the node arrays narrowed to the smallest types that fit.
+
+        Thresholds are rounded down to float32, which keeps every split
+        decision unchanged because inputs are compared as float32 anyway.
+        Node indices become int16 or int32 (wide enough for 2 * index + 1)
+        and feature ids uint8, so only the leaf values lose precision.
+        """
+        n_nodes = len(self.feature)
+        index_dtype = np.int16 if 2 * n_nodes < np.iinfo(np.int16).max else np.int32
+        feature_dtype = np.uint8 if self.feature.max() <= np.iinfo(np.uint8).max else np.int32
+        return FlatForest(
+            feature=self.feature.astype(feature_dtype),
+            threshold=float32_floor(self.threshold),
+            children=self.children.astype(index_dtype),
+            value=self.value.astype(value_dtype),
+            roots=self.roots.astype(index_dtype),
+            **self.meta(),
+        )
+
+    def meta(self):
+        """Everything besides the node arrays needed to rebuild the forest."""
+        return {"max_depth": self.max_depth, "classes": self.classes_, "scaled_input": self.scaled_input}
+
+    def apply(self, X):
+        """Return the leaf index reached in every tree, shape (n_rows, n_trees)."""
+        # sklearn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        row_offset = np.repeat(np.arange(n_rows, dtype=np.int64) * n_features, self.n_trees)
+        idx = np.tile(self.roots, n_rows)
+        for _ in range(self.max_depth):
+            go_right = flat_X.take(row_offset + self.feature.take(idx)) > self.threshold.take(idx)
+            idx = self.children.take(2 * idx + go_right)
+        return idx.reshape(n_rows, self.n_trees)
+
+    def predict_proba(self, X, chunk_size=DEFAULT_CHUNK_SIZE):
+        proba = np.empty((X.shape[0], self.value.shape[1]), dtype=np.float64)
+        for start in range(0, X.shape[0], chunk_size):
+            leaves = self.apply(X[start:start + chunk_size])
+            proba[start:start + chunk_size] = self.value[leaves].mean(axis=1, dtype=np.float64)
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(self.predict_proba(X).argmax(axis=1))
+
+
+def parity_error(model, rf, X, X_ref=None):
+    """Largest absolute difference between model and sklearn probabilities.
+
+    X_ref is what rf sees when it expects different units (e.g. scaled rows).
+    """
+    X_ref = X if X_ref is None else X_ref
+    return float(np.abs(model.predict_proba(X) - rf.predict_proba(X_ref)).max())
+
+
+def scaler_affine(scaler):
+    """Return (a, b) such that scaler.transform(X) == X * a + b."""
+    if hasattr(scaler, "data_min_"):  # MinMaxScaler
+        return scaler.scale_, scaler.min_
+    if hasattr(scaler, "var_") or hasattr(scaler, "mean_"):  # StandardScaler
+        n = scaler.n_features_in_
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n)
+        mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n)
+        return 1.0 / scale, -mean / scale
+    raise ValueError(f"Cannot fold {type(scaler).__name__} into the forest")
+
+
+def probe_rows(scaler, n_probe=256, seed=0):
+    """Integer-valued raw rows spanning (slightly beyond) the scaler's fitted range."""
+    a, b = scaler_affine(scaler)
+    lo, hi = (-0.1, 1.1) if hasattr(scaler, "data_min_") else (-3.0, 3.0)
+    scaled = np.random.default_rng(seed).uniform(lo, hi, size=(n_probe, len(a)))
+    return np.round((scaled - b) / np.where(a == 0, 1.0, a))
+
+
+def fold_scaler(rf, scaler):
+    """Copy rf with every split threshold rewritten into raw feature units.
+
+    Each scaler is an increasing affine map per feature, so
+    x * a + b <= t  <=>  x <= (t - b) / a, and the scaled input is never needed.
+    Inputs are assumed integer-valued, as all features in this app are.
+    """
+    a, b = scaler_affine(scaler)
+    fused = copy.deepcopy(rf)
+    for est in fused.estimators_:
+        tree = est.tree_
+        split = tree.children_left != -1
+        features = tree.feature[split]
+        if (a[features] <= 0).any():
+            raise ValueError("Scaler has non-positive scale on a split feature")
+        # tree_.threshold is a writable view into the node array
+        tree.threshold[split] = (float32_cutoff(tree.threshold[split]) - b[features]) / a[features]
+    return fused
+
+
+def float32_floor(threshold):
+    """Largest float32 not exceeding each threshold.
+
+    For a float32 x, x > threshold exactly when x > float32_floor(threshold).
+    """
+    below = threshold.astype(np.float32)
+    return np.where(below.astype(np.float64) > threshold, np.nextafter(below, np.float32(-np.inf)), below)
+
+
+def float32_cutoff(threshold):
+    """Largest float64 s with float32(s) <= threshold, as sklearn compares them.
+
+    sklearn casts the scaled input to float32 before comparing, so the raw
+    cutoff must be taken at the rounding midpoint above the largest float32
+    not exceeding the threshold, not at the threshold itself.
+    """
+    below = float32_floor(threshold)
+    above = np.nextafter(below, np.float32(np.inf))
+    return (below.astype(np.float64) + above.astype(np.float64)) / 2
+
+
+def fuse_forest(rf, scaler, X_probe, tol=1e-9):
+    """Fold scaler into rf and check equivalence with the scale-then-predict pipeline.
+
+    Returns None if the scaler cannot be folded or the fused forest disagrees.
+    """
+    try:
+        fused = fold_scaler(rf, scaler)
+    except ValueError:
+        return None
+    if parity_error(fused, rf, X_probe, scaler.transform(X_probe)) > tol:
+        return None
+    return fused
+
+
+def compile_forest(rf, X_probe, scaled_input=True, tol=1e-9):
+    """Flatten rf and check it against sklearn on probe rows in rf's own units.
+
+    Returns None when the flattened forest does not reproduce sklearn's
+    probabilities, so callers can fall back to the original estimator.
+    """
+    flat = FlatForest.from_sklearn(rf, scaled_input=scaled_input)
+    if parity_error(flat, rf, X_probe) > tol:
+        return None
+    return flat
+
+
+def compact_forest(flat, X_probe, tol=1e-6):
+    """Compact flat and check it against the full-precision arrays on probe rows.
+
+    X_probe is in the units flat expects. Returns None if any probability
+    moves by more than tol.
+    """
+    compact = flat.compact()
+    if parity_error(compact, flat, X_probe) > tol:
+        return None
+    return compact
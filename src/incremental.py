@@ -0,0 +1,123 @@
+"""Rescore only employees whose inputs changed since the last run.
+
+Usage: python -m src.incremental roster.csv scored.csv [--state score_state.db]
+"""
+import argparse
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from src.prediction import decode_predictions, encode_frame, predict_proba_batch
+from src.utils import load_artifacts
+
+DEFAULT_STATE_DB = "score_state.db"
+DEFAULT_ID_COLUMN = "EmployeeNumber"
+
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+_FNV_PRIME = np.uint64(0x100000001B3)
+
+
+def fingerprints(X):
+    """64-bit fingerprint of each encoded 16-feature row, computed column-wise."""
+    bits = np.ascontiguousarray(X, dtype=np.float64).view(np.uint64)
+    h = np.full(bits.shape[0], _FNV_OFFSET, dtype=np.uint64)
+    for j in range(bits.shape[1]):
+        h ^= bits[:, j]
+        h *= _FNV_PRIME
+        h ^= h >> np.uint64(29)
+    # SQLite integers are signed
+    return h.view(np.int64)
+
+
+class ScoreState:
+    """Last scored fingerprint, probability and label per employee ID."""
+
+    def __init__(self, path=DEFAULT_STATE_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS state (
+                employee_id TEXT PRIMARY KEY,
+                fingerprint INTEGER NOT NULL,
+                probability REAL NOT NULL,
+                attrition TEXT NOT NULL,
+                model_version TEXT NOT NULL
+            )"""
+        )
+        self.conn.commit()
+
+    def load(self):
+        return pd.read_sql_query("SELECT * FROM state", self.conn, index_col="employee_id")
+
+    def save(self, ids, fps, probability, attrition, model_version):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO state VALUES (?, ?, ?, ?, ?)",
+                zip(ids, fps.tolist(), probability.tolist(), attrition.tolist(),
+                    [model_version] * len(ids)),
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+def incremental_score(df, models, state, id_column=DEFAULT_ID_COLUMN):
+    """Score df, running the forest only on new, changed or stale-model rows.
+
+    Returns (scored, n_rescored). `scored` is df plus AttritionProbability,
+    Attrition and a Rescored flag.
+    """
+    if id_column not in df.columns:
+        raise ValueError(f"Missing employee ID column {id_column!r}")
+    ids = df[id_column].astype(str).to_numpy()
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"Duplicate values in {id_column!r}")
+
+    models["validator"].validate_frame(df)
+    X = encode_frame(df, models)
+    fps = fingerprints(X)
+    version = models["manifest"]["sha256"]
+
+    previous = state.load().reindex(ids)
+    stale = (
+        previous["fingerprint"].isna().to_numpy()
+        | (previous["fingerprint"].to_numpy() != fps)
+        | (previous["model_version"].to_numpy() != version)
+    )
+
+    probability = previous["probability"].to_numpy(dtype=np.float64, copy=True)
+    attrition = previous["attrition"].to_numpy(dtype=object, copy=True)
+    if stale.any():
+        proba = predict_proba_batch(X[stale], models)
+        probability[stale] = proba[:, 1]
+        attrition[stale] = decode_predictions(proba, models)
+        state.save(ids[stale].tolist(), fps[stale], probability[stale], attrition[stale], version)
+
+    scored = df.copy()
+    scored["AttritionProbability"] = probability
+    scored["Attrition"] = attrition
+    scored["Rescored"] = stale
+    return scored, int(stale.sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("roster", help="input CSV roster with an employee ID column")
+    parser.add_argument("output", help="where to write the scored CSV")
+    parser.add_argument("--state", default=DEFAULT_STATE_DB, help="SQLite file with previous scores")
+    parser.add_argument("--id-column", default=DEFAULT_ID_COLUMN, help="employee ID column")
+    args = parser.parse_args()
+
+    models = load_artifacts()
+    state = ScoreState(args.state)
+    try:
+        scored, rescored = incremental_score(pd.read_csv(args.roster), models, state, args.id_column)
+    finally:
+        state.close()
+    scored.to_csv(args.output, index=False)
+    print(f"Rescored {rescored:,} of {len(scored):,} employees -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
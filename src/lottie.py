@@ -0,0 +1,61 @@
+"""Minify Lottie animations for faster loading and smaller page payloads.
+
+Usage: python -m src.lottie home.json result.json [--precision 3]
+"""
+import argparse
+import gzip
+import json
+import os
+
+
+def minified_paths(path):
+    stem, _ = os.path.splitext(path)
+    return f"{stem}.min.json.gz", f"{stem}.min.json"
+
+
+def resolve_lottie(path):
+    """Return the smallest available variant of an animation, or None."""
+    for candidate in (*minified_paths(path), path):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def read_lottie(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def round_floats(obj, precision):
+    if isinstance(obj, float):
+        return round(obj, precision)
+    if isinstance(obj, dict):
+        return {k: round_floats(v, precision) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [round_floats(v, precision) for v in obj]
+    return obj
+
+
+def minify_lottie(path, precision=3):
+    """Write a gzipped, compact copy of path with floats rounded to precision digits."""
+    data = round_floats(read_lottie(path), precision)
+    out = minified_paths(path)[0]
+    with gzip.open(out, "wt", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="Lottie JSON files")
+    parser.add_argument("--precision", type=int, default=3, help="decimal places kept for floats")
+    args = parser.parse_args()
+
+    for path in args.paths:
+        out = minify_lottie(path, args.precision)
+        print(f"{path}: {os.path.getsize(path):,} -> {os.path.getsize(out):,} bytes ({out})")
+
+
+if __name__ == "__main__":
+    main()
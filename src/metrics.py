@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NULL_SPAN = nullcontext()
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        running = 0
+        for bound, n in zip(self.buckets, self.counts):
+            running += n
+            if running >= target:
+                return bound
+        return float("inf")
+
+
+class Span:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    """Process-wide stage timings aggregated into histograms.
+
+    When disabled, span() returns a shared no-op context manager so
+    instrumented code pays only an attribute check.
+    """
+
+    def __init__(self, enabled=True, prefix="attrition"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._histograms = {}
+        self._gauges = {}
+        self._gauge_sources = {}
+        self._lock = threading.Lock()
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name)
+
+    def observe(self, name, seconds):
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = Histogram()
+            hist.observe(seconds)
+
+    def set_gauge(self, name, value):
+        with self._lock:
+            self._gauges[name] = value
+
+    def register_gauges(self, name, source):
+        """Register a callable returning {gauge_name: value}, read at export time."""
+        with self._lock:
+            self._gauge_sources[name] = source
+
+    def gauges(self):
+        with self._lock:
+            values = dict(self._gauges)
+            sources = dict(self._gauge_sources)
+        for prefix, source in sources.items():
+            for key, value in source().items():
+                values[f"{prefix}_{key}"] = value
+        return values
+
+    def snapshot(self):
+        """JSON-serializable view of every histogram and gauge."""
+        with self._lock:
+            stages = {
+                name: {
+                    "count": h.count,
+                    "mean_ms": h.sum / h.count * 1000 if h.count else 0.0,
+                    "p50_ms": h.quantile(0.5) * 1000,
+                    "p95_ms": h.quantile(0.95) * 1000,
+                    "p99_ms": h.quantile(0.99) * 1000,
+                }
+                for name, h in sorted(self._histograms.items())
+            }
+        return {"enabled": self.enabled, "stages": stages, "gauges": self.gauges()}
+
+    def prometheus(self):
+        """Render all metrics in the Prometheus text exposition format."""
+        name = f"{self.prefix}_stage_seconds"
+        lines = [f"# HELP {name} Time spent in each prediction stage.", f"# TYPE {name} histogram"]
+        with self._lock:
+            for stage, h in sorted(self._histograms.items()):
+                running = 0
+                for bound, n in zip(h.buckets, h.counts):
+                    running += n
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {running}')
+                lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {h.count}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {h.sum}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {h.count}')
+        for gauge, value in sorted(self.gauges().items()):
+            lines.append(f"# TYPE {self.prefix}_{gauge} gauge")
+            lines.append(f"{self.prefix}_{gauge} {float(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Shared by every module in the process; disable with ATTRITION_METRICS=0
+METRICS = Metrics(enabled=os.environ.get("ATTRITION_METRICS", "1") != "0")
@@ -0,0 +1,83 @@
+import asyncio
+
+import numpy as np
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-row scoring requests into one matrix call.
+
+    The first queued request opens a window of at most `max_wait` seconds;
+    everything arriving in that window (up to `max_batch` rows) is scored by
+    one call to `score_fn(X)` in a worker thread and the rows are fanned back
+    out to their callers. Under no load a request waits at most max_wait.
+    """
+
+    def __init__(self, score_fn, max_batch=64, max_wait=0.002):
+        self.score_fn = score_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.requests = 0
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, x):
+        """Score one encoded feature vector, returning its row of the result."""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((x, future))
+        return await future
+
+    async def _collect(self):
+        items = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(items) < self.max_batch:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = await self._collect()
+            futures = [f for _, f in items]
+            try:
+                X = np.vstack([x for x, _ in items])
+                result = await loop.run_in_executor(None, self.score_fn, X)
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.requests += len(items)
+            for future, row in zip(futures, result):
+                if not future.done():
+                    future.set_result(row)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+        }
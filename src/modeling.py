@@ -0,0 +1,273 @@
+"""Train or extend the attrition forest and write the artifacts load_artifacts() reads.
+
+Usage: python -m src.modeling data/hr_attrition.csv [--out-dir trained_models]
+       python -m src.modeling new_hires.csv --warm-start --model-dir . --extra-trees 50
+"""
+import argparse
+import json
+import os
+import pickle
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+
+from src.preprocessing import TARGET, fit_encoders, load_dataset, prepare
+from src.utils import BUNDLE_FILE, MODEL_FILES, load_artifacts, load_sav_files
+
+DEFAULT_OUT_DIR = "trained_models"
+
+# Searched with cross-validation; every combination is fitted once per fold
+PARAM_GRID = {
+    "n_estimators": [100, 200],
+    "max_depth": [None, 10, 20],
+    "min_samples_leaf": [1, 2, 4],
+    "max_features": ["sqrt", "log2"],
+}
+
+
+def rss_mb():
+    """Current resident memory of this process, or None off Linux."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class StageReport:
+    """Wall-clock time and peak memory of each pipeline stage.
+
+    Memory is the process's resident set sampled every `interval` seconds
+    from a background thread, so it includes the tree nodes sklearn
+    allocates in C (which tracemalloc cannot see, and tracing would slow
+    fitting about threefold). Search workers in other processes are not
+    counted; with one core joblib runs them in this process.
+    """
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        start_rss = rss_mb()
+        peak = [start_rss]
+        done = threading.Event()
+
+        def sample():
+            while not done.wait(self.interval):
+                current = rss_mb()
+                if current is not None and current > peak[0]:
+                    peak[0] = current
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            done.set()
+            sampler.join()
+            end_rss = rss_mb()
+            self.stages.append({
+                "stage": name,
+                "seconds": seconds,
+                "start_rss_mb": start_rss,
+                "peak_rss_mb": max(peak[0], end_rss) if end_rss is not None else None,
+            })
+
+    def table(self):
+        lines = [f"{'stage':<12}{'seconds':>10}{'RSS MB':>10}{'peak MB':>10}"]
+        for s in self.stages:
+            if s["peak_rss_mb"] is None:
+                rss = f"{'-':>10}{'-':>10}"
+            else:
+                rss = f"{s['start_rss_mb']:>10.1f}{s['peak_rss_mb']:>10.1f}"
+            lines.append(f"{s['stage']:<12}{s['seconds']:>10.2f}{rss}")
+        return "\n".join(lines)
+
+
+def search_forest(X, y, param_grid=PARAM_GRID, cv=5, n_jobs=-1, seed=42):
+    """Grid-search a random forest by ROC AUC over stratified folds.
+
+    The folds run in parallel (n_jobs=-1 uses every core); each forest is
+    fitted single-threaded so the workers don't oversubscribe the CPUs.
+    """
+    search = GridSearchCV(
+        RandomForestClassifier(random_state=seed, n_jobs=1),
+        param_grid,
+        scoring="roc_auc",
+        cv=StratifiedKFold(n_splits=cv, shuffle=True, random_state=seed),
+        n_jobs=n_jobs,
+    )
+    return search.fit(X, y)
+
+
+def add_trees(rf, X, y, n_trees, n_jobs=-1):
+    """Grow n_trees more trees on (X, y) and keep the existing ones.
+
+    X must be encoded and scaled with the forest's own encoders and scaler.
+    """
+    missing = set(rf.classes_) - set(np.unique(y))
+    if missing:
+        raise ValueError(f"New data has no rows for class(es) {sorted(missing)}")
+    n_jobs_before = rf.n_jobs
+    rf.set_params(warm_start=True, n_estimators=rf.n_estimators + n_trees, n_jobs=n_jobs)
+    rf.fit(X, y)
+    rf.set_params(warm_start=False, n_jobs=n_jobs_before)
+    return rf
+
+
+def evaluate(rf, X, y):
+    """Held-out metrics, with the encoded "Yes" class (1) as positive."""
+    proba = rf.predict_proba(X)[:, 1]
+    # Same tie-break as argmax over both columns
+    pred = rf.classes_.take((proba > 0.5).astype(np.intp))
+    return {
+        "accuracy": accuracy_score(y, pred),
+        "precision": precision_score(y, pred, zero_division=0),
+        "recall": recall_score(y, pred, zero_division=0),
+        "f1": f1_score(y, pred, zero_division=0),
+        "roc_auc": roc_auc_score(y, proba),
+    }
+
+
+def check_out_dir(out_dir):
+    """Refuse a directory whose model bundle would shadow newly written .sav files.
+
+    load_artifacts() prefers the bundle, so the app (and the verify stage)
+    would keep serving the old model.
+    """
+    if os.path.exists(os.path.join(out_dir, BUNDLE_FILE)):
+        raise ValueError(
+            f"{out_dir} holds {BUNDLE_FILE}, which load_artifacts() prefers over the .sav files; "
+            "write to another directory or remove the bundle (rebuild it afterwards with python -m src.bundle)"
+        )
+
+
+def save_artifacts(out_dir, rf, scaler, encoders):
+    """Pickle the forest, scaler and encoders under their MODEL_FILES names."""
+    check_out_dir(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    objects = dict(encoders, rf=rf, sc=scaler)
+    for key, filename in MODEL_FILES.items():
+        with open(os.path.join(out_dir, filename), "wb") as f:
+            pickle.dump(objects[key], f)
+
+
+def split(df, test_size, seed):
+    return train_test_split(df, test_size=test_size, stratify=df[TARGET], random_state=seed)
+
+
+def train(data_path, out_dir=DEFAULT_OUT_DIR, param_grid=PARAM_GRID, cv=5, n_jobs=-1,
+          test_size=0.2, seed=42):
+    """Fit encoders, scaler and a searched forest on data_path and save them.
+
+    Encoders see the whole dataset so rare categories in the test split are
+    known; the scaler and the search only see the training split.
+    """
+    check_out_dir(out_dir)
+    report = StageReport()
+    with report.stage("load"):
+        df = load_dataset(data_path)
+    with report.stage("preprocess"):
+        encoders = fit_encoders(df)
+        train_df, test_df = split(df, test_size, seed)
+        X_train, y_train, _, scaler = prepare(train_df, encoders)
+        X_test, y_test, _, _ = prepare(test_df, encoders, scaler)
+    with report.stage("search"):
+        search = search_forest(X_train, y_train, param_grid, cv, n_jobs, seed)
+    rf = search.best_estimator_
+    with report.stage("evaluate"):
+        scores = evaluate(rf, X_test, y_test)
+    with report.stage("save"):
+        save_artifacts(out_dir, rf, scaler, encoders)
+    with report.stage("verify"):
+        load_artifacts(out_dir)
+    return {
+        "mode": "train",
+        "rows": len(df),
+        "best_params": search.best_params_,
+        "cv_roc_auc": search.best_score_,
+        "test": scores,
+        "stages": report.stages,
+    }, report
+
+
+def retrain(data_path, model_dir=".", out_dir=DEFAULT_OUT_DIR, extra_trees=50, n_jobs=-1,
+            test_size=0.2, seed=42):
+    """Warm-start extra trees on new data, keeping the existing encoders and scaler."""
+    check_out_dir(out_dir)
+    report = StageReport()
+    with report.stage("load"):
+        models = load_sav_files(model_dir)
+        df = load_dataset(data_path)
+    with report.stage("preprocess"):
+        encoders = {key: models[key] for key in MODEL_FILES if key.startswith("enc_")}
+        train_df, test_df = split(df, test_size, seed)
+        X_train, y_train, _, _ = prepare(train_df, encoders, models["sc"])
+        X_test, y_test, _, _ = prepare(test_df, encoders, models["sc"])
+    rf = models["rf"]
+    with report.stage("evaluate"):
+        before = evaluate(rf, X_test, y_test)
+    with report.stage("add_trees"):
+        add_trees(rf, X_train, y_train, extra_trees, n_jobs)
+    with report.stage("evaluate"):
+        after = evaluate(rf, X_test, y_test)
+    with report.stage("save"):
+        save_artifacts(out_dir, rf, models["sc"], encoders)
+    with report.stage("verify"):
+        load_artifacts(out_dir)
+    return {
+        "mode": "warm_start",
+        "rows": len(df),
+        "n_estimators": rf.n_estimators,
+        "test_before": before,
+        "test": after,
+        "stages": report.stages,
+    }, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("data", help="CSV with the 16 input columns and Attrition (Yes/No)")
+    parser.add_argument("--out-dir", default=DEFAULT_OUT_DIR, help="where to write the .sav artifacts")
+    parser.add_argument("--cv", type=int, default=5, help="cross-validation folds for the search")
+    parser.add_argument("--jobs", type=int, default=-1, help="parallel jobs (default: all cores)")
+    parser.add_argument("--test-size", type=float, default=0.2, help="held-out fraction for evaluation")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for splits and forests")
+    parser.add_argument("--warm-start", action="store_true", help="add trees to an existing forest")
+    parser.add_argument("--model-dir", default=".", help="existing artifacts for --warm-start")
+    parser.add_argument("--extra-trees", type=int, default=50, help="trees to add with --warm-start")
+    parser.add_argument("--report", help="also write the results and stage timings as JSON")
+    args = parser.parse_args()
+
+    try:
+        check_out_dir(args.out_dir)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.warm_start:
+        result, report = retrain(args.data, args.model_dir, args.out_dir, args.extra_trees,
+                                 args.jobs, args.test_size, args.seed)
+        print(f"Grew the forest to {result['n_estimators']} trees")
+        print("Before: " + ", ".join(f"{k} {v:.3f}" for k, v in result["test_before"].items()))
+    else:
+        result, report = train(args.data, args.out_dir, PARAM_GRID, args.cv, args.jobs,
+                               args.test_size, args.seed)
+        print(f"Best parameters: {result['best_params']} (CV ROC AUC {result['cv_roc_auc']:.3f})")
+    print("Test:   " + ", ".join(f"{k} {v:.3f}" for k, v in result["test"].items()))
+    print(report.table())
+    print(f"Artifacts written to {args.out_dir}")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(result, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from src.forest import FLAT_MAX_ROWS
+# The input spec lives in src/schema.py; FEATURES is the column order of the
+# feature vector X built in input_page()
+from src.schema import CATEGORICAL, FEATURES, NUMERIC_RANGES
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def synthetic_roster(n, models, seed=0):
+    """Random employees drawn from the encoders' classes_ and NUMERIC_RANGES."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for col in FEATURES:
+        if col in CATEGORICAL:
+            data[col] = rng.choice(models[CATEGORICAL[col]].classes_, n)
+        else:
+            lo, hi = NUMERIC_RANGES[col]
+            data[col] = rng.integers(lo, hi + 1, n)
+    return pd.DataFrame(data)
+
+
+def read_roster(data, filename):
+    """Read an uploaded roster (CSV or Parquet) into a DataFrame."""
+    if isinstance(data, bytes):
+        data = io.BytesIO(data)
+    if filename.lower().endswith((".parquet", ".pq")):
+        return pd.read_parquet(data)
+    return pd.read_csv(data)
+
+
+def build_lookups(models):
+    """Precompute label -> code tables from each encoder's classes_.
+
+    LabelEncoder codes are positions in the sorted classes_ array, so a dict
+    lookup reproduces transform() without its per-call np.unique machinery.
+    """
+    return {
+        col: {label: code for code, label in enumerate(models[enc].classes_.tolist())}
+        for col, enc in CATEGORICAL.items()
+    }
+
+
+def build_labels(models):
+    """Attrition label ("Yes"/"No") of each predict_proba column, in models["classes"] order."""
+    return models["enc_attrition"].classes_[models["classes"]]
+
+
+def unknown_category(col, values, models):
+    allowed = ", ".join(map(str, models[CATEGORICAL[col]].classes_))
+    shown = ", ".join(repr(v) for v in list(dict.fromkeys(values))[:5])
+    return ValueError(f"Unknown {col} value(s) {shown}; expected one of: {allowed}")
+
+
+def encode_row(record, models):
+    """Encode one employee dict keyed by FEATURES into a 16-element vector."""
+    lookups = models["lookups"]
+    x = np.empty(len(FEATURES), dtype=np.float64)
+    for i, col in enumerate(FEATURES):
+        value = record[col]
+        if col in lookups:
+            code = lookups[col].get(value)
+            if code is None:
+                raise unknown_category(col, [value], models)
+            x[i] = code
+        else:
+            x[i] = value
+    return x
+
+
+def encode_frame(df, models):
+    """Build the (n, 16) feature matrix for a roster, one vectorized pass per column."""
+    missing = [c for c in FEATURES if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    X = np.empty((len(df), len(FEATURES)), dtype=np.float64)
+    for i, col in enumerate(FEATURES):
+        if col in CATEGORICAL:
+            values = df[col].astype(str)
+            codes = pd.Categorical(values, categories=models[CATEGORICAL[col]].classes_).codes
+            if (codes < 0).any():
+                raise unknown_category(col, values[codes < 0], models)
+            X[:, i] = codes
+        else:
+            X[:, i] = pd.to_numeric(df[col], errors="raise").to_numpy(dtype=np.float64)
+    return X
+
+
+def forest_proba(X, models):
+    """Score encoded (unscaled) rows with the fastest available engine.
+
+    Small batches go to the flat forest; larger ones to the scaler-fused
+    sklearn forest. Rows are only scaled when no fused model is available.
+    Compact models have no sklearn forest, so every batch goes to the flat one.
+    """
+    flat = models.get("flat")
+    if flat is not None and (X.shape[0] <= FLAT_MAX_ROWS or models.get("rf") is None):
+        return flat.predict_proba(models["sc"].transform(X) if flat.scaled_input else X)
+    if models.get("fused_rf") is not None:
+        return models["fused_rf"].predict_proba(X)
+    return models["rf"].predict_proba(models["sc"].transform(X))
+
+
+def predict_proba_batch(X, models, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Score X in fixed-size chunks so memory stays bounded."""
+    proba = np.empty((X.shape[0], len(models["classes"])), dtype=np.float64)
+    for start in range(0, X.shape[0], chunk_size):
+        stop = start + chunk_size
+        proba[start:stop] = forest_proba(X[start:stop], models)
+    return proba
+
+
+def decode_predictions(proba, models):
+    """Map probability rows back to the "Yes"/"No" attrition labels."""
+    return models["labels"].take(proba.argmax(axis=1))
+
+
+def predict_one(x, models, cache=None):
+    """Score one encoded feature vector, returning (pred, proba)."""
+    x = np.asarray(x, dtype=np.float64).reshape(1, -1)
+    version = models["manifest"]["sha256"]
+    if cache is not None:
+        hit = cache.get(x, version)
+        if hit is not None:
+            return hit
+
+    # One forest pass; the label is derived from the probabilities
+    proba = predict_proba_batch(x, models)[0]
+    pred = models["classes"][proba.argmax()]
+    if cache is not None:
+        cache.put(x, version, (pred, proba))
+    return pred, proba
+
+
+def score_frame(df, models, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Validate and score a whole roster, returning it with prediction columns appended."""
+    models["validator"].validate_frame(df)
+    X = encode_frame(df, models)
+    proba = predict_proba_batch(X, models, chunk_size)
+
+    out = df.copy()
+    out["AttritionProbability"] = proba[:, 1]
+    out["Attrition"] = decode_predictions(proba, models)
+    return out
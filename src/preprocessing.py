@@ -0,0 +1,49 @@
+"""Turn a raw HR dataset into the encoders, scaler and matrices the forest is trained on."""
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder, MinMaxScaler
+
+from src.prediction import CATEGORICAL, FEATURES, encode_frame
+
+TARGET = "Attrition"
+TARGET_ENCODER = "enc_attrition"
+
+
+def load_dataset(path):
+    """Read a CSV (e.g. the IBM HR attrition dataset) and keep complete rows.
+
+    Only FEATURES and the target are used; rows missing any of them are
+    dropped and categorical values are stripped of surrounding whitespace.
+    """
+    df = pd.read_csv(path)
+    missing = [c for c in FEATURES + [TARGET] if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    df = df[FEATURES + [TARGET]].dropna().reset_index(drop=True)
+    for col in list(CATEGORICAL) + [TARGET]:
+        df[col] = df[col].astype(str).str.strip()
+    return df
+
+
+def fit_encoders(df):
+    """One LabelEncoder per categorical column plus the target, keyed like MODEL_FILES."""
+    encoders = {enc: LabelEncoder().fit(df[col]) for col, enc in CATEGORICAL.items()}
+    encoders[TARGET_ENCODER] = LabelEncoder().fit(df[TARGET])
+    return encoders
+
+
+def encode_target(df, encoders):
+    return encoders[TARGET_ENCODER].transform(df[TARGET])
+
+
+def prepare(df, encoders=None, scaler=None):
+    """Encode and scale df, fitting the encoders and scaler unless given.
+
+    Returns (X_scaled, y, encoders, scaler). Pass the existing encoders and
+    scaler when adding trees to a trained forest so codes stay the same;
+    values they have not seen raise a ValueError.
+    """
+    encoders = encoders or fit_encoders(df)
+    X = encode_frame(df, encoders)
+    y = encode_target(df, encoders)
+    scaler = scaler or MinMaxScaler().fit(X)
+    return scaler.transform(X), y, encoders, scaler
@@ -0,0 +1,206 @@
+"""Trade forest size for latency: evaluate the forest cut to its first k trees and capped depths.
+
+Usage: python -m src.pruning [--data holdout.csv] [--trees 10 25 50 100] [--depths 8 12 16 0]
+       python -m src.pruning --data holdout.csv --emit 50 12 --out-dir pruned_models
+"""
+import argparse
+import copy
+import json
+import pickle
+import time
+
+import numpy as np
+from sklearn.metrics import accuracy_score, roc_auc_score
+
+from src.benchmark import percentiles
+from src.forest import compile_forest, fuse_forest, probe_rows
+from src.modeling import check_out_dir, save_artifacts
+from src.prediction import encode_frame, forest_proba, synthetic_roster
+from src.preprocessing import encode_target, load_dataset
+from src.utils import MODEL_FILES, load_artifacts
+
+TREE_COUNTS = [10, 25, 50, 100]
+# 0 means no cap
+DEPTHS = [8, 12, 16, 0]
+
+DEFAULT_OUT_DIR = "pruned_models"
+SYNTHETIC_ROWS = 5000
+LATENCY_ROWS = 200
+BATCH_ROWS = 10_000
+
+
+def node_depths(left, right):
+    """Depth of every node; sklearn stores children after their parent."""
+    depth = np.zeros(len(left), dtype=np.int64)
+    for node in range(len(left)):
+        if left[node] != -1:
+            depth[left[node]] = depth[right[node]] = depth[node] + 1
+    return depth
+
+
+def cap_tree_depth(tree, max_depth):
+    """A new sklearn Tree with the nodes below max_depth removed.
+
+    Split nodes at max_depth become leaves; sklearn keeps every node's class
+    distribution, so their value is already the leaf prediction.
+    """
+    cls, args, state = tree.__reduce__()
+    nodes, values = state["nodes"], state["values"]
+    depth = node_depths(nodes["left_child"], nodes["right_child"])
+    keep = depth <= max_depth
+    new_index = np.cumsum(keep) - 1
+
+    nodes = nodes[keep].copy()
+    cut = (depth[keep] == max_depth) | (nodes["left_child"] == -1)
+    for child in ("left_child", "right_child"):
+        nodes[child] = np.where(cut, -1, new_index[np.where(cut, 0, nodes[child])])
+    nodes["feature"][cut] = -2
+    nodes["threshold"][cut] = -2.0
+
+    capped = cls(*args)
+    capped.__setstate__(dict(
+        state,
+        max_depth=min(state["max_depth"], max_depth),
+        node_count=len(nodes),
+        nodes=nodes,
+        values=np.ascontiguousarray(values[keep]),
+    ))
+    return capped
+
+
+def prune_forest(rf, n_trees=None, max_depth=None):
+    """Copy of rf keeping its first n_trees trees, each cut to max_depth."""
+    n_trees = min(n_trees or rf.n_estimators, len(rf.estimators_))
+    pruned = copy.copy(rf)
+    pruned.estimators_ = [copy.deepcopy(est) for est in rf.estimators_[:n_trees]]
+    pruned.n_estimators = n_trees
+    if max_depth:
+        for est in pruned.estimators_:
+            if est.tree_.max_depth > max_depth:
+                est.tree_ = cap_tree_depth(est.tree_, max_depth)
+            est.max_depth = max_depth
+        pruned.max_depth = max_depth
+    return pruned
+
+
+def inference_models(rf, models):
+    """A models dict serving rf the way load_artifacts() would."""
+    probe = probe_rows(models["sc"])
+    fused = fuse_forest(rf, models["sc"], probe)
+    if fused is not None:
+        flat = compile_forest(fused, probe, scaled_input=False)
+    else:
+        flat = compile_forest(rf, models["sc"].transform(probe))
+    return dict(models, rf=rf, fused_rf=fused, flat=flat)
+
+
+def evaluation_rows(models, data=None):
+    """Encoded rows and labels from a labeled CSV, or synthetic rows without labels.
+
+    Every labeled row is used; no split is held out, so the CSV should not
+    be the forest's training data.
+    """
+    if data is None:
+        return encode_frame(synthetic_roster(SYNTHETIC_ROWS, models, seed=3), models), None
+    df = load_dataset(data)
+    return encode_frame(df, models), encode_target(df, models)
+
+
+def measure(rf, models, X, y, reference):
+    """Quality against the labels and the full forest, latency and size of rf."""
+    serving = inference_models(rf, models)
+    proba = forest_proba(X, serving)[:, 1]
+    result = {
+        "trees": rf.n_estimators,
+        "max_depth": max(est.tree_.max_depth for est in rf.estimators_),
+        "nodes": sum(est.tree_.node_count for est in rf.estimators_),
+        "pickle_mb": len(pickle.dumps(rf)) / 1e6,
+        "flat_mb": serving["flat"].nbytes / 1e6 if serving["flat"] is not None else None,
+        "max_abs_diff": float(np.abs(proba - reference).max()),
+        "agreement": float(((proba > 0.5) == (reference > 0.5)).mean()),
+    }
+    if y is not None:
+        result["accuracy"] = accuracy_score(y, rf.classes_.take((proba > 0.5).astype(np.intp)))
+        result["auc"] = roc_auc_score(y, proba)
+
+    samples = []
+    for x in X[:LATENCY_ROWS]:
+        start = time.perf_counter()
+        forest_proba(x.reshape(1, -1), serving)
+        samples.append(time.perf_counter() - start)
+    result["single_row"] = percentiles(samples)
+    batch = X[np.arange(BATCH_ROWS) % len(X)]
+    start = time.perf_counter()
+    forest_proba(batch, serving)
+    result["batch_rows_per_s"] = BATCH_ROWS / (time.perf_counter() - start)
+    return result
+
+
+def sweep(models, X, y=None, tree_counts=TREE_COUNTS, depths=DEPTHS):
+    """Measure every (first k trees, depth cap) combination, full forest first."""
+    rf = models["rf"]
+    reference = forest_proba(X, models)[:, 1]
+    configs = [(None, None)] + [
+        (k, d or None) for k in tree_counts for d in depths
+        if k <= rf.n_estimators and (k, d or None) != (rf.n_estimators, None)
+    ]
+    return [measure(prune_forest(rf, k, d), models, X, y, reference) for k, d in configs]
+
+
+def format_table(results):
+    labeled = "auc" in results[0]
+    header = f"{'trees':>6}{'depth':>7}{'nodes':>9}{'flat MB':>9}{'p50 ms':>8}{'rows/s':>10}{'agree':>8}"
+    header += f"{'acc':>7}{'auc':>7}" if labeled else ""
+    lines = [header]
+    for r in results:
+        line = (
+            f"{r['trees']:>6}{r['max_depth']:>7}{r['nodes']:>9,}"
+            f"{r['flat_mb'] or 0:>9.2f}{r['single_row']['p50_ms']:>8.3f}"
+            f"{r['batch_rows_per_s']:>10,.0f}{r['agreement']:>8.3f}"
+        )
+        if labeled:
+            line += f"{r['accuracy']:>7.3f}{r['auc']:>7.3f}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", default=".", help="directory holding the model artifacts")
+    parser.add_argument("--data", help="labeled CSV (16 inputs + Attrition) the forest was not trained on, "
+                             "for accuracy and AUC")
+    parser.add_argument("--trees", type=int, nargs="+", default=TREE_COUNTS, help="tree counts to try")
+    parser.add_argument("--depths", type=int, nargs="+", default=DEPTHS, help="depth caps (0 = none)")
+    parser.add_argument("--report", help="also write the results as JSON")
+    parser.add_argument("--emit", type=int, nargs=2, metavar=("TREES", "DEPTH"),
+                        help="write this pruned forest (DEPTH 0 = no cap) with the other artifacts")
+    parser.add_argument("--out-dir", default=DEFAULT_OUT_DIR, help="where --emit writes the artifacts")
+    args = parser.parse_args()
+    if args.emit:
+        try:
+            check_out_dir(args.out_dir)
+        except ValueError as e:
+            parser.error(str(e))
+
+    # Pruning needs the sklearn forest, which compact mode drops
+    models = load_artifacts(args.dir, compact=False)
+    X, y = evaluation_rows(models, args.data)
+    results = sweep(models, X, y, args.trees, args.depths)
+    if y is None:
+        print(f"No --data given: agreement is measured on {len(X):,} synthetic employees")
+    print(format_table(results))
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.emit:
+        trees, depth = args.emit
+        pruned = prune_forest(models["rf"], trees, depth or None)
+        encoders = {key: models[key] for key in MODEL_FILES if key.startswith("enc_")}
+        save_artifacts(args.out_dir, pruned, models["sc"], encoders)
+        load_artifacts(args.out_dir)
+        print(f"Wrote a {pruned.n_estimators}-tree forest to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
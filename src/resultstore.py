@@ -0,0 +1,89 @@
+import json
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+
+# Trim the SQLite table once every this many inserts
+PRUNE_EVERY = 256
+
+
+class ResultStore:
+    """Bounded store of prediction results by ID, so sessions only hold the ID.
+
+    The newest `maxsize` results are kept in an in-process LRU. With `path`,
+    results are also written to a SQLite file that other replicas sharing it
+    can read back; the file keeps the newest `max_rows`. Results must be
+    JSON-serializable.
+    """
+
+    def __init__(self, maxsize=1024, path=None, max_rows=100_000):
+        self.maxsize = maxsize
+        self.path = path
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._puts = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.conn = None
+        if path:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS results (id TEXT PRIMARY KEY, payload TEXT NOT NULL)"
+            )
+            self.conn.commit()
+
+    def _remember(self, key, result):
+        self._data[key] = result
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def put(self, result):
+        """Store result and return its new ID."""
+        key = uuid.uuid4().hex
+        with self._lock:
+            self._remember(key, result)
+            if self.conn is not None:
+                self.conn.execute("INSERT INTO results VALUES (?, ?)", (key, json.dumps(result)))
+                self._puts += 1
+                if self._puts % PRUNE_EVERY == 0:
+                    self.conn.execute(
+                        "DELETE FROM results WHERE rowid <= (SELECT MAX(rowid) FROM results) - ?",
+                        (self.max_rows,),
+                    )
+                self.conn.commit()
+        return key
+
+    def get(self, key):
+        """The result stored under key, or None if it was evicted or never existed."""
+        with self._lock:
+            result = self._data.get(key)
+            if result is None and self.conn is not None:
+                row = self.conn.execute("SELECT payload FROM results WHERE id = ?", (key,)).fetchone()
+                if row is not None:
+                    result = json.loads(row[0])
+            if result is None:
+                self.misses += 1
+                return None
+            self._remember(key, result)
+            self.hits += 1
+            return result
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
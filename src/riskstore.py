@@ -0,0 +1,306 @@
+"""Persisted, indexed store of scored employees for fast risk queries.
+
+Usage:
+    python -m src.riskstore add scored.csv [--id-column EmployeeNumber]
+    python -m src.riskstore top -k 100 --filter Department=Sales --filter OverTime=Yes
+    python -m src.riskstore groups Department
+    python -m src.riskstore rollup JobRole
+    python -m src.riskstore rebuild
+"""
+import argparse
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from src.prediction import CATEGORICAL
+
+DEFAULT_DB = "risk_index.db"
+DEFAULT_ID_COLUMN = "EmployeeNumber"
+
+# Categorical fields known to the enc_*.sav encoders, filterable and groupable
+DIMENSIONS = list(CATEGORICAL)
+HIGH_RISK = 0.7
+
+# Probability histogram kept per cohort: HIST_BINS equal-width bins over [0, 1]
+HIST_BINS = 10
+BIN_COLUMNS = [f"bin_{i}" for i in range(HIST_BINS)]
+# Rollup key of the all-employees row
+TOTAL = "*"
+# IDs per "IN (...)" lookup, well under SQLite's bound-parameter limit
+ID_BATCH = 500
+
+
+def rollup_deltas(rows, sign=1):
+    """Per-(dim, value) changes to the rollups from adding (sign=1) or removing (-1) rows."""
+    if rows.empty:
+        return pd.DataFrame()
+    p = rows["probability"].to_numpy(dtype=np.float64)
+    stats = pd.DataFrame({
+        "employees": sign,
+        "sum_risk": sign * p,
+        "high_risk": sign * (p >= HIGH_RISK).astype(np.int64),
+    })
+    bins = np.minimum((p * HIST_BINS).astype(np.int64), HIST_BINS - 1)
+    for i, col in enumerate(BIN_COLUMNS):
+        stats[col] = sign * (bins == i).astype(np.int64)
+
+    parts = [stats.sum().to_frame().T.assign(dim=TOTAL, value=TOTAL)]
+    for d in DIMENSIONS:
+        part = stats.groupby(rows[d].to_numpy()).sum()
+        parts.append(part.rename_axis("value").reset_index().assign(dim=d))
+    return pd.concat(parts, ignore_index=True)
+
+
+class RiskStore:
+    """SQLite table of scores with one (dimension, probability) index per field.
+
+    Top-k queries walk an index in probability order and stop after k rows;
+    range filters and group aggregates are answered from the covering
+    indexes without touching the table or rescoring anyone.
+
+    One connection is shared by every thread (the app keeps a single store
+    for all sessions), so each method holds a lock for its whole transaction.
+    """
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        columns = ", ".join(f'"{d}" TEXT' for d in DIMENSIONS)
+        self.conn.execute(
+            f"""CREATE TABLE IF NOT EXISTS scores (
+                employee_id TEXT PRIMARY KEY,
+                {columns},
+                probability REAL NOT NULL,
+                attrition TEXT,
+                model_version TEXT,
+                scored_at TEXT
+            )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_probability ON scores (probability DESC)")
+        for d in DIMENSIONS:
+            self.conn.execute(
+                f'CREATE INDEX IF NOT EXISTS "idx_{d}" ON scores ("{d}", probability DESC)'
+            )
+        bins = ", ".join(f"{c} INTEGER NOT NULL" for c in BIN_COLUMNS)
+        self.conn.execute(
+            f"""CREATE TABLE IF NOT EXISTS rollups (
+                dim TEXT NOT NULL,
+                value TEXT NOT NULL,
+                employees INTEGER NOT NULL,
+                sum_risk REAL NOT NULL,
+                high_risk INTEGER NOT NULL,
+                {bins},
+                PRIMARY KEY (dim, value)
+            )"""
+        )
+        self.conn.commit()
+        # Indexes built before rollups existed get theirs computed once
+        if self._rollups_missing():
+            self.rebuild_rollups()
+
+    def _rollups_missing(self):
+        has_scores = self.conn.execute("SELECT 1 FROM scores LIMIT 1").fetchone()
+        has_rollups = self.conn.execute("SELECT 1 FROM rollups LIMIT 1").fetchone()
+        return has_scores is not None and has_rollups is None
+
+    def _apply_deltas(self, deltas):
+        if deltas.empty:
+            return
+        deltas = deltas.groupby(["dim", "value"], sort=False).sum().reset_index()
+        columns = ["dim", "value", "employees", "sum_risk", "high_risk"] + BIN_COLUMNS
+        updates = ", ".join(f"{c} = {c} + excluded.{c}" for c in columns[2:])
+        self.conn.executemany(
+            f"""INSERT INTO rollups ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})
+                ON CONFLICT (dim, value) DO UPDATE SET {updates}""",
+            deltas[columns].astype(object).itertuples(index=False, name=None),
+        )
+
+    def _replaced_rows(self, ids):
+        """Stored rows for ids, whose contribution must leave the rollups."""
+        dims = ", ".join(f'"{d}"' for d in DIMENSIONS)
+        ids = list(ids)
+        found = []
+        for start in range(0, len(ids), ID_BATCH):
+            batch = ids[start:start + ID_BATCH]
+            found.append(pd.read_sql_query(
+                f"SELECT {dims}, probability FROM scores WHERE employee_id IN ({', '.join('?' * len(batch))})",
+                self.conn, params=batch,
+            ))
+        return pd.concat(found, ignore_index=True) if found else pd.DataFrame()
+
+    def rebuild_rollups(self, chunk_size=100_000):
+        """Recompute the rollups from every stored score."""
+        dims = ", ".join(f'"{d}"' for d in DIMENSIONS)
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM rollups")
+            for chunk in pd.read_sql_query(
+                f"SELECT {dims}, probability FROM scores", self.conn, chunksize=chunk_size
+            ):
+                self._apply_deltas(rollup_deltas(chunk))
+
+    def add(self, scored, model_version=None, id_column=DEFAULT_ID_COLUMN):
+        """Insert or replace rows of a scored roster (output of score_frame).
+
+        Pass the model's manifest["sha256"] as model_version: the bundle's
+        "version" label is the constant "sav" for the individual .sav files.
+
+        Rows are keyed on id_column, which must be present: falling back to
+        row positions would let unrelated rosters overwrite each other.
+        """
+        with self._lock, self.conn:
+            return self._add_rows(scored, model_version, id_column)
+
+    def add_chunks(self, chunks, model_version=None, id_column=DEFAULT_ID_COLUMN):
+        """add() every chunk in a single transaction, so a failure adds none of them."""
+        with self._lock, self.conn:
+            return sum(self._add_rows(chunk, model_version, id_column) for chunk in chunks)
+
+    def _add_rows(self, scored, model_version, id_column):
+        if id_column not in scored.columns:
+            raise ValueError(f"Missing employee ID column {id_column!r}")
+        rows = pd.DataFrame({"employee_id": scored[id_column].astype(str).to_numpy()})
+        for d in DIMENSIONS:
+            rows[d] = scored[d].astype(str).to_numpy()
+        rows["probability"] = scored["AttritionProbability"].to_numpy()
+        rows["attrition"] = scored["Attrition"].astype(str).to_numpy()
+        rows["model_version"] = model_version
+        rows["scored_at"] = datetime.now(timezone.utc).isoformat()
+        # Only the last score for a repeated ID survives the REPLACE
+        rows = rows.drop_duplicates("employee_id", keep="last")
+
+        columns = ", ".join(f'"{c}"' for c in rows.columns)
+        marks = ", ".join("?" * len(rows.columns))
+        old = self._replaced_rows(rows["employee_id"])
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO scores ({columns}) VALUES ({marks})",
+            rows.itertuples(index=False, name=None),
+        )
+        self._apply_deltas(pd.concat([rollup_deltas(rows), rollup_deltas(old, -1)]))
+        return len(rows)
+
+    @staticmethod
+    def _where(filters, min_risk, max_risk):
+        clauses, params = [], []
+        for d, value in (filters or {}).items():
+            if d not in DIMENSIONS:
+                raise ValueError(f"Unknown filter {d!r}; expected one of: {', '.join(DIMENSIONS)}")
+            clauses.append(f'"{d}" = ?')
+            params.append(str(value))
+        if min_risk is not None:
+            clauses.append("probability >= ?")
+            params.append(min_risk)
+        if max_risk is not None:
+            clauses.append("probability <= ?")
+            params.append(max_risk)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def top_k(self, k=100, filters=None, min_risk=None, max_risk=None):
+        """Highest-risk employees matching the filters, highest first."""
+        where, params = self._where(filters, min_risk, max_risk)
+        with self._lock:
+            return pd.read_sql_query(
+                f"SELECT * FROM scores{where} ORDER BY probability DESC LIMIT ?",
+                self.conn, params=params + [k],
+            )
+
+    def count(self, filters=None, min_risk=None, max_risk=None):
+        where, params = self._where(filters, min_risk, max_risk)
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM scores{where}", params).fetchone()[0]
+
+    def groups(self, by, filters=None, min_risk=None, max_risk=None):
+        """Count, mean/max risk and high-risk headcount per value of one dimension."""
+        if by not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension {by!r}; expected one of: {', '.join(DIMENSIONS)}")
+        where, params = self._where(filters, min_risk, max_risk)
+        with self._lock:
+            return pd.read_sql_query(
+                f"""SELECT "{by}", COUNT(*) AS employees, AVG(probability) AS mean_risk,
+                           MAX(probability) AS max_risk,
+                           SUM(probability >= {HIGH_RISK}) AS high_risk
+                    FROM scores{where} GROUP BY "{by}" ORDER BY mean_risk DESC""",
+                self.conn, params=params,
+            )
+
+    def rollup(self, by=TOTAL):
+        """Pre-aggregated risk per value of one dimension (or overall with TOTAL).
+
+        Reads only the rollup rows, so the cost does not grow with the number
+        of employees scored. Bin columns count employees per probability decile.
+        """
+        if by != TOTAL and by not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension {by!r}; expected one of: {', '.join(DIMENSIONS)}")
+        with self._lock:
+            cohorts = pd.read_sql_query(
+                f"""SELECT value AS "{by}", employees, sum_risk / employees AS mean_risk, high_risk,
+                           {", ".join(BIN_COLUMNS)}
+                    FROM rollups WHERE dim = ? AND employees > 0 ORDER BY mean_risk DESC""",
+                self.conn, params=[by],
+            )
+        return cohorts.drop(columns=by) if by == TOTAL else cohorts
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def parse_filters(items):
+    filters = {}
+    for item in items or []:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise SystemExit(f"Filters must look like Field=Value, got {item!r}")
+        filters[key] = value
+    return filters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=DEFAULT_DB, help="SQLite index file")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add = sub.add_parser("add", help="index a scored roster CSV")
+    add.add_argument("scored", help="CSV written by batch scoring")
+    add.add_argument("--id-column", default=DEFAULT_ID_COLUMN, help="employee ID column")
+
+    rollup = sub.add_parser("rollup", help="pre-aggregated risk per cohort")
+    rollup.add_argument("by", nargs="?", default=TOTAL, choices=DIMENSIONS + [TOTAL],
+                        help="dimension to break down (default: all employees)")
+
+    sub.add_parser("rebuild", help="recompute the rollups from the stored scores")
+
+    for name in ("top", "groups"):
+        cmd = sub.add_parser(name)
+        if name == "top":
+            cmd.add_argument("-k", type=int, default=100, help="number of employees")
+        else:
+            cmd.add_argument("by", choices=DIMENSIONS, help="dimension to group by")
+        cmd.add_argument("--filter", action="append", help="Field=Value, repeatable")
+        cmd.add_argument("--min-risk", type=float, help="lowest probability to include")
+        cmd.add_argument("--max-risk", type=float, help="highest probability to include")
+    args = parser.parse_args()
+
+    store = RiskStore(args.db)
+    try:
+        if args.command == "add":
+            n = store.add(pd.read_csv(args.scored), id_column=args.id_column)
+            print(f"Indexed {n:,} employees in {args.db}")
+        elif args.command == "rebuild":
+            store.rebuild_rollups()
+            print(f"Rebuilt rollups for {store.count():,} employees in {args.db}")
+        elif args.command == "rollup":
+            print(store.rollup(args.by).to_string(index=False))
+        elif args.command == "top":
+            print(store.top_k(args.k, parse_filters(args.filter), args.min_risk, args.max_risk).to_string(index=False))
+        else:
+            print(store.groups(args.by, parse_filters(args.filter), args.min_risk, args.max_risk).to_string(index=False))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
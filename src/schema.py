@@ -0,0 +1,157 @@
+"""Declarative spec of the 16 model inputs, shared by the app, batch scoring and the API."""
+import numpy as np
+import pandas as pd
+
+
+class Field:
+    """One model input: its dtype and either inclusive bounds or the encoder holding its categories."""
+
+    __slots__ = ("name", "dtype", "low", "high", "encoder")
+
+    def __init__(self, name, dtype, low=None, high=None, encoder=None):
+        self.name = name
+        self.dtype = dtype
+        self.low = low
+        self.high = high
+        self.encoder = encoder
+
+    @property
+    def is_category(self):
+        return self.dtype == "category"
+
+
+# In the column order the forest and scaler were fitted on. Numeric bounds
+# match the widgets in input_page(); categories come from the encoders.
+SCHEMA = [
+    Field("Age", "int", 18, 65),
+    Field("Gender", "category", encoder="enc_gender"),
+    Field("MaritalStatus", "category", encoder="enc_maritalstatus"),
+    Field("Department", "category", encoder="enc_department"),
+    Field("BusinessTravel", "category", encoder="enc_businesstravel"),
+    Field("JobRole", "category", encoder="enc_jobrole"),
+    Field("JobLevel", "int", 1, 5),
+    Field("Education", "int", 1, 5),
+    Field("EducationField", "category", encoder="enc_educationfield"),
+    Field("OverTime", "category", encoder="enc_overtime"),
+    Field("TotalWorkingYears", "int", 0, 40),
+    Field("YearsAtCompany", "int", 0, 40),
+    Field("YearsInCurrentRole", "int", 0, 20),
+    Field("MonthlyIncome", "float", 0, 20000),
+    Field("DistanceFromHome", "float", 0, 50),
+    Field("JobSatisfaction", "int", 1, 4),
+]
+
+FEATURES = [f.name for f in SCHEMA]
+CATEGORICAL = {f.name: f.encoder for f in SCHEMA if f.is_category}
+NUMERIC_RANGES = {f.name: (f.low, f.high) for f in SCHEMA if not f.is_category}
+
+# Row errors quoted in a ValueError before the rest are summarized
+MAX_REPORTED = 10
+
+
+def format_errors(errors, limit=MAX_REPORTED):
+    """One message for a check_frame() result, listing the first `limit` problems."""
+    lines = [f"row {row}: {message}" for row, message in zip(errors["row"][:limit], errors["message"][:limit])]
+    more = len(errors) - limit
+    if more > 0:
+        lines.append(f"... and {more:,} more")
+    n_rows = errors["row"].nunique()
+    return f"{n_rows:,} invalid row(s): " + "; ".join(lines)
+
+
+class Validator:
+    """SCHEMA compiled against the loaded encoders.
+
+    Allowed categories are resolved once. check_frame() tests each column of
+    a whole roster in one vectorized pass; check_record() is the scalar
+    version for single employees.
+    """
+
+    def __init__(self, schema, models):
+        self.schema = schema
+        self.categories = {
+            f.name: pd.Index(models[f.encoder].classes_.astype(str))
+            for f in schema if f.is_category
+        }
+        self.allowed = {name: ", ".join(index) for name, index in self.categories.items()}
+
+    @classmethod
+    def from_models(cls, models):
+        return cls(SCHEMA, models)
+
+    def check_record(self, record):
+        """List of problems with one employee dict keyed by FEATURES."""
+        errors = []
+        for f in self.schema:
+            value = record.get(f.name)
+            if value is None:
+                errors.append(f"{f.name} is missing")
+            elif f.is_category:
+                if str(value) not in self.categories[f.name]:
+                    errors.append(f"{f.name} '{value}' is not one of: {self.allowed[f.name]}")
+            elif isinstance(value, bool) or not isinstance(value, (int, float, np.number)):
+                errors.append(f"{f.name} '{value}' is not a number")
+            elif not f.low <= value <= f.high:
+                errors.append(f"{f.name} {value} is outside {f.low}-{f.high}")
+            elif f.dtype == "int" and value != int(value):
+                errors.append(f"{f.name} {value} is not a whole number")
+        return errors
+
+    def check_frame(self, df, offset=0):
+        """Problems in a roster as a DataFrame of (row, field, message), ordered by row.
+
+        Rows are numbered by position from `offset`; the frame is empty when
+        every row is valid. Missing columns raise a ValueError outright.
+        """
+        missing = [f.name for f in self.schema if f.name not in df.columns]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+        found = []
+
+        def text(col, rows):
+            # Only the offending values are formatted
+            return col.iloc[rows].astype(str)
+
+        def report(mask, field, messages):
+            rows = np.flatnonzero(mask)
+            if len(rows):
+                found.append(pd.DataFrame({
+                    "row": rows + offset,
+                    "field": field,
+                    "message": messages(rows),
+                }))
+
+        for f in self.schema:
+            col = df[f.name]
+            absent = col.isna().to_numpy()
+            report(absent, f.name, lambda rows: f"{f.name} is missing")
+            if f.is_category:
+                bad = ~col.isin(self.categories[f.name]).to_numpy() & ~absent
+                if bad.any():
+                    # Non-string values (e.g. 1 for "1") are accepted as encode_frame does
+                    bad[bad] = ~col[bad].astype(str).isin(self.categories[f.name]).to_numpy()
+                suffix = f"' is not one of: {self.allowed[f.name]}"
+                report(bad, f.name, lambda rows: (f"{f.name} '" + text(col, rows) + suffix).to_numpy())
+                continue
+            num = pd.to_numeric(col, errors="coerce").to_numpy(dtype=np.float64)
+            report(np.isnan(num) & ~absent, f.name,
+                   lambda rows: (f"{f.name} '" + text(col, rows) + "' is not a number").to_numpy())
+            outside = (num < f.low) | (num > f.high)
+            report(outside, f.name,
+                   lambda rows: (f"{f.name} " + text(col, rows) + f" is outside {f.low}-{f.high}").to_numpy())
+            if f.dtype == "int":
+                fractional = (num % 1 != 0) & ~np.isnan(num) & ~outside
+                report(fractional, f.name,
+                       lambda rows: (f"{f.name} " + text(col, rows) + " is not a whole number").to_numpy())
+
+        if not found:
+            return pd.DataFrame({"row": [], "field": [], "message": []})
+        errors = pd.concat(found, ignore_index=True)
+        return errors.sort_values("row", kind="stable", ignore_index=True)
+
+    def validate_frame(self, df, offset=0):
+        """Raise a ValueError describing every invalid row of df, if any."""
+        errors = self.check_frame(df, offset)
+        if len(errors):
+            raise ValueError(format_errors(errors))
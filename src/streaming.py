@@ -0,0 +1,137 @@
+"""Score arbitrarily large rosters chunk by chunk with flat memory use.
+
+Usage: python -m src.streaming roster.csv scored.parquet [--chunk-size N]
+"""
+import argparse
+import os
+
+import pandas as pd
+
+from src.prediction import decode_predictions, encode_frame, predict_proba_batch
+from src.riskstore import DEFAULT_ID_COLUMN, RiskStore
+from src.utils import load_artifacts
+
+DEFAULT_STREAM_CHUNK = 100_000
+
+
+def is_parquet(path):
+    return path.lower().endswith((".parquet", ".pq"))
+
+
+def iter_roster(path, chunk_size=DEFAULT_STREAM_CHUNK):
+    """Yield DataFrames of at most chunk_size rows from a CSV or Parquet file."""
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def score_chunks(chunks, models):
+    """Validate, encode and score each chunk as it arrives."""
+    offset = 0
+    for chunk in chunks:
+        try:
+            models["validator"].validate_frame(chunk, offset)
+            X = encode_frame(chunk, models)
+        except ValueError as e:
+            raise ValueError(f"Rows {offset}-{offset + len(chunk) - 1}: {e}") from None
+        proba = predict_proba_batch(X, models)
+        chunk = chunk.copy()
+        chunk["AttritionProbability"] = proba[:, 1]
+        chunk["Attrition"] = decode_predictions(proba, models)
+        offset += len(chunk)
+        yield chunk
+
+
+class CsvSink:
+    def __init__(self, path):
+        self.file = open(path, "w", newline="")
+        self.header = True
+
+    def write(self, chunk):
+        chunk.to_csv(self.file, header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetSink:
+    def __init__(self, path):
+        self.path = path
+        self.writer = None
+
+    def write(self, chunk):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.writer is None:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        else:
+            # Keep every row group on the first chunk's schema
+            table = pa.Table.from_pandas(chunk, schema=self.writer.schema, preserve_index=False)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def stream_score(src, dst, models, chunk_size=DEFAULT_STREAM_CHUNK, progress=None, store=None):
+    """Score src into dst one chunk at a time; returns the number of rows written.
+
+    Peak memory is bounded by chunk_size regardless of file size, and the
+    first chunk is on disk before the rest of the input has been read.
+    With a `store` (a RiskStore), dst is read back in chunks once every row
+    has been scored and added in one transaction, so a failed run leaves
+    the index untouched.
+    """
+    sink = ParquetSink(dst) if is_parquet(dst) else CsvSink(dst)
+    rows = 0
+    try:
+        for chunk in score_chunks(iter_roster(src, chunk_size), models):
+            if store is not None and rows == 0 and DEFAULT_ID_COLUMN not in chunk.columns:
+                raise ValueError(f"Missing employee ID column {DEFAULT_ID_COLUMN!r} needed for --index")
+            sink.write(chunk)
+            rows += len(chunk)
+            if progress is not None:
+                progress(rows)
+    except BaseException:
+        sink.close()
+        if os.path.exists(dst):
+            os.remove(dst)
+        raise
+    sink.close()
+    if store is not None:
+        store.add_chunks(iter_roster(dst, chunk_size), models["manifest"]["sha256"])
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("roster", help="input CSV or Parquet roster")
+    parser.add_argument("output", help="output CSV or Parquet file")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_STREAM_CHUNK, help="rows per chunk")
+    parser.add_argument("--index", metavar="DB", help="also add scores to this risk index")
+    args = parser.parse_args()
+
+    models = load_artifacts()
+    store = RiskStore(args.index) if args.index else None
+    try:
+        rows = stream_score(
+            args.roster, args.output, models, args.chunk_size,
+            progress=lambda n: print(f"\rScored {n:,} rows", end="", flush=True),
+            store=store,
+        )
+    finally:
+        if store is not None:
+            store.close()
+    print(f"\nWrote {rows:,} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+
+from src.forest import compact_forest, compile_forest, fuse_forest, probe_rows
+from src.prediction import build_labels, build_lookups
+from src.schema import Validator
+
+# Artifacts consumed by the app, keyed the same way load_models() exposes them
+MODEL_FILES = {
+    "rf": "rf.sav",
+    "sc": "sc.sav",
+    "enc_attrition": "enc_attrition.sav",
+    "enc_businesstravel": "enc_businesstravel.sav",
+    "enc_department": "enc_department.sav",
+    "enc_educationfield": "enc_educationfield.sav",
+    "enc_gender": "enc_gender.sav",
+    "enc_jobrole": "enc_jobrole.sav",
+    "enc_maritalstatus": "enc_maritalstatus.sav",
+    "enc_overtime": "enc_overtime.sav",
+}
+
+# Single-file bundle produced by `python -m src.bundle`
+BUNDLE_FILE = "model_bundle.pkl"
+MANIFEST_FILE = "model_bundle.json"
+BUNDLE_FORMAT = 1
+
+logger = logging.getLogger(__name__)
+
+# Set to 1 to keep only the compacted flat forest in memory (see load_artifacts)
+COMPACT_ENV = "ATTRITION_COMPACT"
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def read_manifest(base_dir="."):
+    with open(os.path.join(base_dir, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+def check_manifest(manifest, payload):
+    """Check a bundle payload against its manifest, raising ValueError on mismatch."""
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"Unsupported model bundle format: {manifest.get('format')}")
+    digest = hashlib.sha256(payload).hexdigest()
+    if digest != manifest["sha256"]:
+        raise ValueError(f"Model bundle checksum mismatch: expected {manifest['sha256']}, got {digest}")
+
+
+def load_bundle(base_dir=".", verify=True):
+    """Load every artifact from the bundle with a single read of one file."""
+    manifest = read_manifest(base_dir)
+    with open(os.path.join(base_dir, BUNDLE_FILE), "rb") as f:
+        payload = f.read()
+    if verify:
+        check_manifest(manifest, payload)
+    models = pickle.loads(payload)
+    models["manifest"] = manifest
+    return models
+
+
+def load_sav_files(base_dir="."):
+    """Load the forest, scaler and label encoders from the individual .sav files."""
+    models = {}
+    digests = hashlib.sha256()
+    for key, name in MODEL_FILES.items():
+        path = os.path.join(base_dir, name)
+        models[key] = load_pickle(path)
+        digests.update(file_sha256(path).encode())
+    models["manifest"] = {"version": "sav", "sha256": digests.hexdigest()}
+    return models
+
+
+def check_engine(models, name, engine, requested=True):
+    """Record in models["engines"] whether a requested engine passed its parity check.
+
+    A failed check falls back to the next engine; it is logged as a warning
+    and exported as a 0 gauge so the slowdown does not go unnoticed.
+    """
+    if requested:
+        models["engines"][name] = int(engine is not None)
+        if engine is None:
+            logger.warning("%s failed its parity check against sklearn and is disabled", name)
+    return engine
+
+
+def load_artifacts(base_dir=".", flat=True, fuse_scaler=True, compact=None):
+    """Load the model bundle if one has been built, otherwise the .sav files.
+
+    Categorical lookup tables are precomputed under models["lookups"], the
+    attrition label of each probability column under models["labels"], and the
+    input schema is compiled against the encoders under models["validator"].
+    With fuse_scaler=True the scaler is folded into a copy of the forest under
+    models["fused_rf"], which takes raw encoded rows. With flat=True the
+    (fused, if available) forest is also compiled into a FlatForest under
+    models["flat"]. Either is None if it fails its check against sklearn;
+    models["engines"] maps each engine checked to 1 (in use) or 0 (disabled).
+
+    With compact=True (default: the ATTRITION_COMPACT environment variable)
+    the flat forest is narrowed to compact dtypes and both sklearn forests are
+    dropped, so models["rf"] and models["fused_rf"] are None and every batch
+    is scored from the compact arrays. Falls back to the full models if the
+    compact forest fails its check.
+    """
+    if compact is None:
+        compact = os.environ.get(COMPACT_ENV) == "1"
+    if os.path.exists(os.path.join(base_dir, BUNDLE_FILE)):
+        models = load_bundle(base_dir)
+    else:
+        models = load_sav_files(base_dir)
+    models["lookups"] = build_lookups(models)
+    models["validator"] = Validator.from_models(models)
+    models["classes"] = models["rf"].classes_
+    models["labels"] = build_labels(models)
+
+    models["engines"] = {}
+    probe = probe_rows(models["sc"])
+    models["fused_rf"] = check_engine(
+        models, "fused_rf", fuse_forest(models["rf"], models["sc"], probe) if fuse_scaler else None, fuse_scaler
+    )
+    if flat or compact:
+        if models["fused_rf"] is not None:
+            models["flat"] = compile_forest(models["fused_rf"], probe, scaled_input=False)
+        else:
+            models["flat"] = compile_forest(models["rf"], models["sc"].transform(probe))
+        check_engine(models, "flat", models["flat"])
+    if compact and models["flat"] is not None:
+        flat_probe = models["sc"].transform(probe) if models["flat"].scaled_input else probe
+        compacted = check_engine(models, "compact", compact_forest(models["flat"], flat_probe))
+        if compacted is not None:
+            models.update(flat=compacted, rf=None, fused_rf=None)
+    return models
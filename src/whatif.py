@@ -0,0 +1,44 @@
+import numpy as np
+
+from src.prediction import CATEGORICAL, FEATURES, NUMERIC_RANGES, forest_proba
+
+# Features offered in the what-if panel and how many points to sweep for numeric ones
+WHATIF_FEATURES = ["MonthlyIncome", "OverTime", "JobLevel", "DistanceFromHome"]
+MAX_POINTS = 101
+
+
+def axis_values(feature, models, points=MAX_POINTS):
+    """Return (encoded values, display labels) to sweep for one feature."""
+    if feature in CATEGORICAL:
+        classes = models[CATEGORICAL[feature]].classes_
+        return np.arange(len(classes), dtype=np.float64), [str(c) for c in classes]
+    lo, hi = NUMERIC_RANGES[feature]
+    values = np.unique(np.round(np.linspace(lo, hi, min(points, hi - lo + 1))))
+    return values, values.tolist()
+
+
+def build_grid(x, axes):
+    """Copy x once per grid point with the swept features replaced.
+
+    axes maps feature name -> 1-D array of encoded values; the result has
+    one row per point of their Cartesian product, in C order.
+    """
+    x = np.asarray(x, dtype=np.float64).ravel()
+    mesh = np.meshgrid(*axes.values(), indexing="ij")
+    X = np.tile(x, (mesh[0].size, 1))
+    for feature, values in zip(axes, mesh):
+        X[:, FEATURES.index(feature)] = values.ravel()
+    return X
+
+
+def sweep(x, features, models, points=MAX_POINTS):
+    """Score a 1-D or 2-D what-if sweep around x in one forest call.
+
+    Returns (axes, labels, risk) where risk has one dimension per feature.
+    """
+    axes, labels = {}, {}
+    for feature in features:
+        axes[feature], labels[feature] = axis_values(feature, models, points)
+    X = build_grid(x, axes)
+    proba = forest_proba(X, models)
+    return axes, labels, proba[:, 1].reshape([len(v) for v in axes.values()])
@@ -0,0 +1,9 @@
+import pytest
+
+from src.utils import load_artifacts
+
+
+@pytest.fixture(scope="session")
+def models():
+    """The shipped artifacts with the full (non-compact) engines."""
+    return load_artifacts(".", compact=False)
@@ -0,0 +1,11 @@
+import shutil
+
+from src.benchmark import bench_cold_start
+from src.utils import MODEL_FILES
+
+
+def test_cold_start_loads_artifacts_from_another_directory(tmp_path):
+    for filename in MODEL_FILES.values():
+        shutil.copy(filename, tmp_path)
+    result = bench_cold_start(str(tmp_path), repeats=1)
+    assert result["runs"] == 1 and result["min_s"] > 0
@@ -0,0 +1,52 @@
+import numpy as np
+
+from src.cache import PredictionCache
+
+X1 = np.arange(16, dtype=np.float64)
+X2 = X1 + 1
+X3 = X1 + 2
+
+
+def test_hit_after_put():
+    cache = PredictionCache()
+    assert cache.get(X1, "v1") is None
+    cache.put(X1, "v1", ("pred", 0.4))
+    assert cache.get(X1, "v1") == ("pred", 0.4)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_key_ignores_shape_and_dtype():
+    cache = PredictionCache()
+    cache.put(X1.reshape(1, -1), "v1", "value")
+    assert cache.get(X1.astype(np.int64), "v1") == "value"
+
+
+def test_evicts_least_recently_used():
+    cache = PredictionCache(maxsize=2)
+    cache.put(X1, "v1", 1)
+    cache.put(X2, "v1", 2)
+    cache.get(X1, "v1")
+    cache.put(X3, "v1", 3)
+    assert cache.get(X2, "v1") is None
+    assert cache.get(X1, "v1") == 1 and cache.get(X3, "v1") == 3
+    assert cache.stats()["size"] == 2
+
+
+def test_expires_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("src.cache.time.monotonic", lambda: now[0])
+    cache = PredictionCache(ttl=60)
+    cache.put(X1, "v1", "value")
+    now[0] += 60
+    assert cache.get(X1, "v1") == "value"
+    now[0] += 1
+    assert cache.get(X1, "v1") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_new_version_clears_entries():
+    cache = PredictionCache()
+    cache.put(X1, "v1", "old")
+    assert cache.get(X1, "v2") is None
+    assert cache.get(X1, "v1") is None
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,87 @@
+import itertools
+from math import factorial
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.explain import TreeExplainer, explain_rows
+from src.prediction import encode_frame, forest_proba, synthetic_roster
+
+
+@pytest.fixture(scope="module")
+def X(models):
+    return encode_frame(synthetic_roster(40, models, seed=41), models)
+
+
+@pytest.fixture(scope="module")
+def unfused(models):
+    return TreeExplainer(models["rf"], models["rf"].n_features_in_, scaled_input=True)
+
+
+def test_fused_contributions_add_up_to_probability(models, X):
+    explainer = TreeExplainer.from_models(models)
+    assert not explainer.scaled_input
+    phi = explain_rows(X, models, explainer)
+    np.testing.assert_allclose(phi.sum(axis=1) + explainer.expected_value, forest_proba(X, models)[:, 1],
+                               rtol=0, atol=1e-12)
+
+
+def test_unfused_contributions_add_up_to_probability(models, X, unfused):
+    phi = explain_rows(X, models, unfused)
+    np.testing.assert_allclose(phi.sum(axis=1) + unfused.expected_value, forest_proba(X, models)[:, 1],
+                               rtol=0, atol=1e-12)
+
+
+def test_fused_and_unfused_agree(models, X, unfused):
+    fused = TreeExplainer.from_models(models)
+    np.testing.assert_allclose(explain_rows(X, models, fused), explain_rows(X, models, unfused),
+                               rtol=0, atol=1e-12)
+
+
+def conditional_value(tree, x, subset, node=0):
+    """Path-dependent E[f(x) | x_S]: features outside S follow both children by cover."""
+    left, right = tree.children_left[node], tree.children_right[node]
+    if left == -1:
+        value = tree.value[node, 0]
+        return value[1] / value.sum()
+    f = tree.feature[node]
+    if f in subset:
+        child = left if np.float32(x[f]) <= tree.threshold[node] else right
+        return conditional_value(tree, x, subset, child)
+    cover = tree.weighted_n_node_samples
+    return (cover[left] * conditional_value(tree, x, subset, left)
+            + cover[right] * conditional_value(tree, x, subset, right)) / cover[node]
+
+
+def brute_force_shap(rf, x):
+    n = len(x)
+    phi = np.zeros(n)
+    for est in rf.estimators_:
+        for j in range(n):
+            others = [f for f in range(n) if f != j]
+            for k in range(n):
+                weight = factorial(k) * factorial(n - k - 1) / factorial(n)
+                for subset in itertools.combinations(others, k):
+                    s = set(subset)
+                    phi[j] += weight * (conditional_value(est.tree_, x, s | {j})
+                                        - conditional_value(est.tree_, x, s))
+    return phi / len(rf.estimators_)
+
+
+def test_matches_brute_force_shapley_values():
+    rng = np.random.default_rng(0)
+    X_train = rng.integers(0, 6, size=(300, 4)).astype(float)
+    y = (X_train[:, 0] + X_train[:, 1] * X_train[:, 2] > 8).astype(int)
+    rf = RandomForestClassifier(n_estimators=5, max_depth=4, random_state=0).fit(X_train, y)
+    explainer = TreeExplainer(rf, 4)
+    for x in X_train[:10]:
+        np.testing.assert_allclose(explainer.shap_values(x)[0], brute_force_shap(rf, x), rtol=0, atol=1e-12)
+
+
+def test_matches_shap_package(models, X, unfused):
+    shap = pytest.importorskip("shap")
+    X_scaled = models["sc"].transform(X[:10])
+    expected = shap.TreeExplainer(models["rf"]).shap_values(X_scaled)
+    expected = expected[..., 1] if np.ndim(expected) == 3 else expected[1]
+    np.testing.assert_allclose(unfused.shap_values(X_scaled), expected, rtol=0, atol=1e-9)
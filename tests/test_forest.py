@@ -0,0 +1,99 @@
+"""Parity of the flat, fused and compact engines with sklearn's scale-then-predict pipeline."""
+import logging
+
+import numpy as np
+import pytest
+
+from src.forest import compact_forest, compile_forest, probe_rows
+from src.prediction import encode_frame, synthetic_roster
+from src.utils import load_artifacts
+
+# FlatForest and the fused forest must reproduce sklearn exactly; compact
+# stores leaf values as float32
+EXACT = 1e-9
+COMPACT_TOL = 1e-6
+
+
+@pytest.fixture(scope="module")
+def rosters(models):
+    """Encoded synthetic employees and rows sitting on either side of every split."""
+    X = encode_frame(synthetic_roster(5000, models, seed=11), models)
+    return {"synthetic": X, "boundary": boundary_rows(models, X[:64])}
+
+
+def boundary_rows(models, base):
+    """Copies of base rows with one feature set next to a split threshold.
+
+    Inputs are integer-valued, so the integers on both sides of each fused
+    (raw-unit) threshold are exactly where a rounding error would flip a split.
+    """
+    values = set()
+    for est in models["fused_rf"].estimators_:
+        tree = est.tree_
+        split = tree.children_left != -1
+        for f, t in zip(tree.feature[split], tree.threshold[split]):
+            values.update({(f, np.floor(t)), (f, np.floor(t) + 1)})
+    rows = []
+    for i, (f, v) in enumerate(sorted(values)):
+        row = base[i % len(base)].copy()
+        row[f] = v
+        rows.append(row)
+    return np.array(rows)
+
+
+def reference(models, X):
+    return models["rf"].predict_proba(models["sc"].transform(X))
+
+
+def flat_input(flat, models, X):
+    return models["sc"].transform(X) if flat.scaled_input else X
+
+
+@pytest.mark.parametrize("roster", ["synthetic", "boundary"])
+def test_fused_matches_sklearn(models, rosters, roster):
+    X = rosters[roster]
+    assert models["fused_rf"] is not None
+    np.testing.assert_allclose(models["fused_rf"].predict_proba(X), reference(models, X), rtol=0, atol=EXACT)
+
+
+@pytest.mark.parametrize("roster", ["synthetic", "boundary"])
+def test_flat_matches_sklearn(models, rosters, roster):
+    X = rosters[roster]
+    flat = models["flat"]
+    assert flat is not None
+    np.testing.assert_allclose(flat.predict_proba(flat_input(flat, models, X)), reference(models, X),
+                               rtol=0, atol=EXACT)
+
+
+@pytest.mark.parametrize("roster", ["synthetic", "boundary"])
+def test_unfused_flat_matches_sklearn(models, rosters, roster):
+    X = rosters[roster]
+    flat = compile_forest(models["rf"], models["sc"].transform(probe_rows(models["sc"])))
+    assert flat is not None and flat.scaled_input
+    np.testing.assert_allclose(flat.predict_proba(models["sc"].transform(X)), reference(models, X),
+                               rtol=0, atol=EXACT)
+
+
+@pytest.mark.parametrize("roster", ["synthetic", "boundary"])
+def test_compact_within_tolerance(models, rosters, roster):
+    X = rosters[roster]
+    flat = models["flat"]
+    compact = compact_forest(flat, flat_input(flat, models, probe_rows(models["sc"])))
+    assert compact is not None
+    np.testing.assert_allclose(compact.predict_proba(flat_input(flat, models, X)), reference(models, X),
+                               rtol=0, atol=COMPACT_TOL)
+
+
+def test_compact_mode_serves_compact_forest():
+    models = load_artifacts(".", compact=True)
+    assert models["rf"] is None and models["fused_rf"] is None
+    assert models["engines"] == {"fused_rf": 1, "flat": 1, "compact": 1}
+
+
+def test_failed_check_is_reported(monkeypatch, caplog):
+    monkeypatch.setattr("src.utils.fuse_forest", lambda *args: None)
+    with caplog.at_level(logging.WARNING, logger="src.utils"):
+        models = load_artifacts(".", compact=False)
+    assert models["fused_rf"] is None
+    assert models["engines"] == {"fused_rf": 0, "flat": 1}
+    assert "fused_rf failed its parity check" in caplog.text
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.incremental
+from src.incremental import DEFAULT_ID_COLUMN, ScoreState, fingerprints, incremental_score
+from src.prediction import encode_frame, score_frame, synthetic_roster
+
+
+@pytest.fixture(scope="module")
+def roster(models):
+    roster = synthetic_roster(500, models, seed=61)
+    roster[DEFAULT_ID_COLUMN] = np.arange(500)
+    return roster
+
+
+@pytest.fixture
+def state(tmp_path):
+    state = ScoreState(str(tmp_path / "state.db"))
+    yield state
+    state.close()
+
+
+@pytest.fixture
+def scored_rows(monkeypatch):
+    """Number of rows sent to the forest by each incremental_score call."""
+    calls = []
+    real = src.incremental.predict_proba_batch
+
+    def counting(X, models):
+        calls.append(len(X))
+        return real(X, models)
+
+    monkeypatch.setattr(src.incremental, "predict_proba_batch", counting)
+    return calls
+
+
+def assert_matches_full_scoring(scored, roster, models):
+    pd.testing.assert_frame_equal(scored.drop(columns="Rescored"), score_frame(roster, models), check_dtype=False)
+
+
+def test_only_changed_and_new_ids_are_rescored(models, roster, state, scored_rows):
+    first, n = incremental_score(roster, models, state)
+    assert n == len(roster) and first["Rescored"].all()
+
+    changed = roster.copy()
+    changed.loc[[3, 7], "MonthlyIncome"] += 1000
+    new = synthetic_roster(5, models, seed=62)
+    new[DEFAULT_ID_COLUMN] = np.arange(1000, 1005)
+    changed = pd.concat([changed, new], ignore_index=True)
+
+    second, n = incremental_score(changed, models, state)
+    assert n == 7 and scored_rows == [500, 7]
+    assert second.index[second["Rescored"]].tolist() == [3, 7] + list(range(500, 505))
+    assert_matches_full_scoring(second, changed, models)
+
+
+def test_unchanged_roster_reuses_every_score(models, roster, state, scored_rows):
+    incremental_score(roster, models, state)
+    again, n = incremental_score(roster, models, state)
+    assert n == 0 and scored_rows == [500]
+    assert_matches_full_scoring(again, roster, models)
+
+
+def test_new_model_rescores_everyone(models, roster, state):
+    incremental_score(roster, models, state)
+    retrained = dict(models, manifest=dict(models["manifest"], sha256="another-model"))
+    _, n = incremental_score(roster, retrained, state)
+    assert n == len(roster)
+
+
+def test_duplicate_ids_are_rejected(models, roster, state):
+    duplicated = pd.concat([roster, roster.head(1)], ignore_index=True)
+    with pytest.raises(ValueError, match="Duplicate values in 'EmployeeNumber'"):
+        incremental_score(duplicated, models, state)
+
+
+def test_missing_id_column_is_rejected(models, roster, state):
+    with pytest.raises(ValueError, match="Missing employee ID column"):
+        incremental_score(roster.drop(columns=DEFAULT_ID_COLUMN), models, state)
+
+
+def test_fingerprints_change_with_any_feature(models, roster):
+    X = encode_frame(roster.head(50), models)
+    base = fingerprints(X)
+    assert len(set(base.tolist())) == len(base)
+    for j in range(X.shape[1]):
+        bumped = X.copy()
+        bumped[:, j] += 1
+        assert (fingerprints(bumped) != base).all()
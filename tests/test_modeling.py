@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from src.modeling import retrain, train
+from src.prediction import encode_frame, forest_proba, synthetic_roster
+from src.preprocessing import TARGET
+from src.utils import BUNDLE_FILE, load_artifacts
+
+TINY_GRID = {"n_estimators": [5], "max_depth": [4]}
+
+
+@pytest.fixture(scope="module")
+def labeled_csv(models, tmp_path_factory):
+    df = synthetic_roster(400, models, seed=71)
+    df[TARGET] = np.where((df["OverTime"] == "Yes") & (df["JobSatisfaction"] <= 2), "Yes", "No")
+    path = tmp_path_factory.mktemp("data") / "labeled.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def test_train_writes_loadable_artifacts(labeled_csv, tmp_path):
+    result, _ = train(labeled_csv, str(tmp_path), TINY_GRID, cv=2, n_jobs=1)
+    trained = load_artifacts(str(tmp_path))
+    assert trained["rf"].n_estimators == 5 and result["test"]["roc_auc"] > 0.5
+    X = encode_frame(synthetic_roster(50, trained, seed=72), trained)
+    np.testing.assert_array_equal(forest_proba(X, trained), trained["rf"].predict_proba(trained["sc"].transform(X)))
+
+
+def test_warm_start_adds_trees(labeled_csv, tmp_path):
+    base, grown = tmp_path / "base", tmp_path / "grown"
+    train(labeled_csv, str(base), TINY_GRID, cv=2, n_jobs=1)
+    result, _ = retrain(labeled_csv, str(base), str(grown), extra_trees=3, n_jobs=1)
+    assert result["n_estimators"] == 8 and load_artifacts(str(grown))["rf"].n_estimators == 8
+
+
+def test_refuses_directory_with_a_bundle(labeled_csv, tmp_path):
+    (tmp_path / BUNDLE_FILE).write_bytes(b"stale")
+    with pytest.raises(ValueError, match=BUNDLE_FILE):
+        train(labeled_csv, str(tmp_path), TINY_GRID, cv=2, n_jobs=1)
+    with pytest.raises(ValueError, match=BUNDLE_FILE):
+        retrain(labeled_csv, ".", str(tmp_path), extra_trees=3, n_jobs=1)
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from src.parallel import score_frame_parallel, score_parallel
+from src.prediction import encode_frame, predict_proba_batch, score_frame, synthetic_roster
+from src.utils import load_artifacts
+
+
+@pytest.fixture(scope="module")
+def roster(models):
+    return synthetic_roster(2500, models, seed=21)
+
+
+def test_sklearn_workers_match_serial(models, roster):
+    X = encode_frame(roster, models)
+    np.testing.assert_array_equal(score_parallel(X, models, workers=2, task_rows=500),
+                                  predict_proba_batch(X, models))
+
+
+def test_shared_flat_workers_match_serial_without_fork(models, roster, monkeypatch):
+    monkeypatch.setattr("src.parallel.can_fork", lambda: False)
+    X = encode_frame(roster, models)
+    np.testing.assert_array_equal(score_parallel(X, models, workers=2, task_rows=500),
+                                  predict_proba_batch(X, models))
+
+
+def test_compact_workers_match_serial(roster):
+    compact = load_artifacts(".", compact=True)
+    X = encode_frame(roster, compact)
+    np.testing.assert_array_equal(score_parallel(X, compact, workers=2, task_rows=500),
+                                  predict_proba_batch(X, compact))
+
+
+def test_frame_matches_score_frame(models, roster):
+    expected = score_frame(roster, models)
+    assert score_frame_parallel(roster, models, workers=2, task_rows=700).equals(expected)
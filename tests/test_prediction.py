@@ -0,0 +1,9 @@
+import numpy as np
+
+from src.prediction import decode_predictions
+
+
+def test_labels_match_label_encoder(models):
+    proba = np.array([[0.9, 0.1], [0.2, 0.8], [0.5, 0.5]])
+    expected = models["enc_attrition"].inverse_transform(models["classes"].take(proba.argmax(axis=1)))
+    assert decode_predictions(proba, models).tolist() == expected.tolist()
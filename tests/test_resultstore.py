@@ -0,0 +1,63 @@
+import threading
+
+import src.resultstore
+from src.resultstore import ResultStore
+
+
+def test_put_then_get():
+    store = ResultStore()
+    key = store.put({"proba": [0.6, 0.4]})
+    assert store.get(key) == {"proba": [0.6, 0.4]}
+    assert store.get("missing") is None
+    assert store.stats()["hits"] == 1 and store.stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used():
+    store = ResultStore(maxsize=2)
+    first, second = store.put(1), store.put(2)
+    store.get(first)
+    third = store.put(3)
+    assert store.get(second) is None
+    assert store.get(first) == 1 and store.get(third) == 3
+    assert store.stats()["evictions"] == 1 and store.stats()["size"] == 2
+
+
+def test_evicted_results_are_read_back_from_sqlite(tmp_path):
+    path = str(tmp_path / "results.db")
+    store = ResultStore(maxsize=1, path=path)
+    first = store.put({"pred": "Yes"})
+    store.put({"pred": "No"})
+    assert first not in store._data
+    assert store.get(first) == {"pred": "Yes"}
+    store.close()
+
+    # Another replica sharing the file sees both results
+    replica = ResultStore(path=path)
+    assert replica.get(first) == {"pred": "Yes"}
+    replica.close()
+
+
+def test_sqlite_keeps_newest_max_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(src.resultstore, "PRUNE_EVERY", 4)
+    store = ResultStore(maxsize=1, path=str(tmp_path / "results.db"), max_rows=3)
+    keys = [store.put(i) for i in range(8)]
+    assert store.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 3
+    assert [store.get(k) for k in keys] == [None] * 5 + [5, 6, 7]
+    store.close()
+
+
+def test_concurrent_puts_all_stored(tmp_path):
+    store = ResultStore(maxsize=10_000, path=str(tmp_path / "results.db"))
+    keys = []
+
+    def put_many(worker):
+        for i in range(200):
+            keys.append((store.put([worker, i]), [worker, i]))
+
+    threads = [threading.Thread(target=put_many, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(keys) == 800 and all(store.get(k) == v for k, v in keys)
+    store.close()
@@ -0,0 +1,187 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.prediction import score_frame, synthetic_roster
+from src.riskstore import BIN_COLUMNS, DEFAULT_ID_COLUMN, DIMENSIONS, HIGH_RISK, HIST_BINS, RiskStore
+from src.streaming import stream_score
+
+
+def scored_roster(models, n, seed, first_id=0):
+    roster = synthetic_roster(n, models, seed=seed)
+    roster[DEFAULT_ID_COLUMN] = np.arange(first_id, first_id + n)
+    return score_frame(roster, models)
+
+
+@pytest.fixture(scope="module")
+def scored(models):
+    return scored_roster(models, 2000, seed=51)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RiskStore(str(tmp_path / "risk.db"))
+    yield store
+    store.close()
+
+
+def test_filters_combine_with_risk_range(store, scored):
+    store.add(scored)
+    filters = {"Department": "Sales", "OverTime": "Yes"}
+    found = store.top_k(10_000, filters, min_risk=0.4, max_risk=0.5)
+    expected = scored[(scored["Department"] == "Sales") & (scored["OverTime"] == "Yes")
+                      & scored["AttritionProbability"].between(0.4, 0.5)]
+    assert len(expected) > 0
+    assert sorted(found["employee_id"]) == sorted(expected[DEFAULT_ID_COLUMN].astype(str))
+    assert store.count(filters, min_risk=0.4, max_risk=0.5) == len(expected)
+
+
+def test_top_k_is_highest_first(store, scored):
+    store.add(scored)
+    top = store.top_k(25)
+    assert len(top) == 25
+    assert top["probability"].is_monotonic_decreasing
+    expected = scored["AttritionProbability"].nlargest(25).to_numpy()
+    np.testing.assert_allclose(top["probability"], expected)
+
+
+def test_groups_match_pandas(store, scored):
+    store.add(scored)
+    groups = store.groups("JobRole", min_risk=0.3).set_index("JobRole").sort_index()
+    subset = scored[scored["AttritionProbability"] >= 0.3]
+    expected = subset.groupby("JobRole")["AttritionProbability"]
+    assert groups["employees"].to_dict() == expected.size().to_dict()
+    np.testing.assert_allclose(groups["mean_risk"], expected.mean().sort_index())
+    np.testing.assert_allclose(groups["max_risk"], expected.max().sort_index())
+    assert groups["high_risk"].to_dict() == (subset["AttritionProbability"] >= HIGH_RISK).groupby(
+        subset["JobRole"]).sum().to_dict()
+
+
+def test_re_added_employee_is_replaced(store, scored):
+    store.add(scored, model_version="old")
+    rescored = scored.head(10).copy()
+    rescored["AttritionProbability"] = 0.99
+    rescored["Department"] = "Human Resources"
+    assert store.add(rescored, model_version="new") == 10
+    assert store.count() == len(scored)
+    top = store.top_k(10)
+    assert sorted(top["employee_id"]) == sorted(rescored[DEFAULT_ID_COLUMN].astype(str))
+    assert (top["model_version"] == "new").all() and (top["Department"] == "Human Resources").all()
+
+
+def test_repeated_id_in_one_roster_keeps_last(store, scored):
+    twice = pd.concat([scored.head(3), scored.head(3).assign(AttritionProbability=0.95)])
+    assert store.add(twice) == 3
+    assert (store.top_k(3)["probability"] == 0.95).all()
+
+
+def test_roster_without_ids_is_rejected(store, scored):
+    with pytest.raises(ValueError, match="Missing employee ID column 'EmployeeNumber'"):
+        store.add(scored.drop(columns=DEFAULT_ID_COLUMN))
+    assert store.count() == 0
+
+
+def test_unknown_field_is_rejected(store):
+    with pytest.raises(ValueError, match="Unknown filter 'Salary'"):
+        store.top_k(filters={"Salary": "high"})
+    with pytest.raises(ValueError, match="Unknown dimension 'Salary'"):
+        store.groups("Salary")
+
+
+def assert_rollups_match_scores(store):
+    """Every rollup agrees with aggregating the scores table directly."""
+    scores = store.top_k(10**9)
+    for d in DIMENSIONS:
+        rollup = store.rollup(d).set_index(d).sort_index()
+        groups = store.groups(d).set_index(d).sort_index()
+        assert rollup["employees"].to_dict() == groups["employees"].to_dict()
+        np.testing.assert_allclose(rollup["mean_risk"], groups["mean_risk"], rtol=0, atol=1e-12)
+        assert rollup["high_risk"].to_dict() == groups["high_risk"].to_dict()
+        bins = np.minimum((scores["probability"] * HIST_BINS).astype(int), HIST_BINS - 1)
+        histogram = pd.crosstab(scores[d], bins).reindex(columns=range(HIST_BINS), fill_value=0)
+        np.testing.assert_array_equal(rollup[BIN_COLUMNS].to_numpy(), histogram.sort_index().to_numpy())
+    total = store.rollup()
+    assert total["employees"].tolist() == [store.count()]
+    np.testing.assert_allclose(total["mean_risk"], [scores["probability"].mean()], rtol=0, atol=1e-12)
+
+
+def test_rollups_follow_overlapping_adds(store, models):
+    store.add(scored_roster(models, 1000, seed=52))
+    # Half of these IDs are rescored, most with different fields and risk
+    store.add(scored_roster(models, 1000, seed=53, first_id=500))
+    assert store.count() == 1500
+    assert_rollups_match_scores(store)
+
+
+def test_rescoring_moves_employees_between_cohorts(store, scored):
+    store.add(scored)
+    moved = scored.head(50).assign(Department="Human Resources", AttritionProbability=0.95)
+    store.add(moved)
+    assert_rollups_match_scores(store)
+    assert store.rollup()["high_risk"].iloc[0] == (
+        (scored["AttritionProbability"].iloc[50:] >= HIGH_RISK).sum() + 50)
+
+
+def test_rebuild_round_trip(tmp_path, models):
+    path = str(tmp_path / "risk.db")
+    store = RiskStore(path)
+    store.add(scored_roster(models, 800, seed=54))
+    store.add(scored_roster(models, 800, seed=55, first_id=400))
+    before = {d: store.rollup(d) for d in DIMENSIONS}
+    store.rebuild_rollups()
+    for d in DIMENSIONS:
+        pd.testing.assert_frame_equal(store.rollup(d), before[d], check_exact=False, rtol=1e-12)
+
+    # An index written before rollups existed gets them on open
+    store.conn.execute("DELETE FROM rollups")
+    store.conn.commit()
+    store.close()
+    reopened = RiskStore(path)
+    for d in DIMENSIONS:
+        pd.testing.assert_frame_equal(reopened.rollup(d), before[d], check_exact=False, rtol=1e-12)
+    reopened.close()
+
+
+def test_concurrent_adds_keep_rollups_consistent(store, models):
+    rosters = [scored_roster(models, 600, seed=60 + i, first_id=300 * i) for i in range(6)]
+    errors = []
+
+    def save(scored):
+        try:
+            for _ in range(2):
+                store.add(scored)
+                store.rollup("Department")
+        except Exception as e:  # surfaced below; threads swallow exceptions
+            errors.append(e)
+
+    threads = [threading.Thread(target=save, args=(r,)) for r in rosters]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert store.count() == 300 * 5 + 600
+    assert_rollups_match_scores(store)
+
+
+def test_failed_stream_leaves_index_empty(store, models, tmp_path):
+    roster = synthetic_roster(2500, models, seed=56)
+    roster[DEFAULT_ID_COLUMN] = np.arange(len(roster))
+    roster.loc[2200, "Age"] = 5
+    src = tmp_path / "roster.csv"
+    roster.to_csv(src, index=False)
+    with pytest.raises(ValueError):
+        stream_score(str(src), str(tmp_path / "scored.csv"), models, chunk_size=1000, store=store)
+    assert store.count() == 0 and store.rollup().empty
+
+
+def test_stream_indexes_every_row(store, models, tmp_path):
+    roster = synthetic_roster(2500, models, seed=57)
+    roster[DEFAULT_ID_COLUMN] = np.arange(len(roster))
+    src = tmp_path / "roster.csv"
+    roster.to_csv(src, index=False)
+    stream_score(str(src), str(tmp_path / "scored.parquet"), models, chunk_size=1000, store=store)
+    assert store.count() == 2500
+    assert_rollups_match_scores(store)
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+from src.prediction import synthetic_roster
+from src.schema import MAX_REPORTED, Field, Validator, format_errors
+
+
+@pytest.fixture(scope="module")
+def validator(models):
+    return models["validator"]
+
+
+@pytest.fixture
+def roster(models):
+    return synthetic_roster(30, models, seed=81)
+
+
+def messages(errors):
+    return dict(zip(errors["row"], errors["message"]))
+
+
+def test_valid_roster_has_no_errors(validator, roster):
+    assert validator.check_frame(roster).empty
+    validator.validate_frame(roster)
+
+
+def test_each_kind_of_problem_is_reported(validator, roster):
+    bad = roster.astype({"Age": object, "JobLevel": float, "MonthlyIncome": float})
+    bad.loc[1, "Age"] = 5
+    bad.loc[2, "Age"] = "abc"
+    bad.loc[3, "JobLevel"] = 2.5
+    bad.loc[4, "MonthlyIncome"] = np.nan
+    bad.loc[5, "Gender"] = None
+    bad.loc[6, "Department"] = "Marketing"
+    errors = validator.check_frame(bad)
+    assert errors["row"].tolist() == [1, 2, 3, 4, 5, 6]
+    found = messages(errors)
+    assert found[1] == "Age 5 is outside 18-65"
+    assert found[2] == "Age 'abc' is not a number"
+    assert found[3] == "JobLevel 2.5 is not a whole number"
+    assert found[4] == "MonthlyIncome is missing"
+    assert found[5] == "Gender is missing"
+    assert found[6].startswith("Department 'Marketing' is not one of: Human Resources, ")
+
+
+def test_several_problems_in_one_row(validator, roster):
+    bad = roster.copy()
+    bad.loc[0, ["Age", "JobSatisfaction"]] = [99, 0]
+    assert validator.check_frame(bad)["field"].tolist() == ["Age", "JobSatisfaction"]
+
+
+def test_check_record_agrees_with_check_frame(validator, roster):
+    bad = roster.astype({"Age": object, "JobLevel": float})
+    bad.loc[1, "Age"] = 5
+    bad.loc[2, "Age"] = "abc"
+    bad.loc[3, "JobLevel"] = 2.5
+    bad.loc[6, "Department"] = "Marketing"
+    found = messages(validator.check_frame(bad))
+    for i, record in enumerate(bad.to_dict("records")):
+        assert validator.check_record(record) == ([found[i]] if i in found else [])
+
+
+def test_check_record_rejects_missing_and_boolean_values(validator, roster):
+    record = roster.iloc[0].to_dict()
+    del record["Age"]
+    record["OverTime"] = "Maybe"
+    record["JobLevel"] = True
+    errors = validator.check_record(record)
+    assert errors[0] == "Age is missing"
+    assert "JobLevel 'True' is not a number" in errors
+    assert any(e.startswith("OverTime 'Maybe' is not one of: No, Yes") for e in errors)
+
+
+def test_numeric_values_match_string_categories():
+    encoder = LabelEncoder().fit(["1", "2"])
+    validator = Validator([Field("Level", "category", encoder="enc_level")], {"enc_level": encoder})
+    errors = validator.check_frame(pd.DataFrame({"Level": [1, "2", 3, 2.0]}, dtype=object))
+    assert errors["row"].tolist() == [2, 3]
+    assert errors["message"].tolist() == ["Level '3' is not one of: 1, 2", "Level '2.0' is not one of: 1, 2"]
+    assert validator.check_record({"Level": 1}) == []
+
+
+def test_offset_numbers_rows_from_the_chunk_start(validator, roster):
+    bad = roster.copy()
+    bad.loc[7, "Age"] = 70
+    errors = validator.check_frame(bad, offset=1000)
+    assert errors["row"].tolist() == [1007]
+    with pytest.raises(ValueError, match="row 1007: Age 70 is outside 18-65"):
+        validator.validate_frame(bad, offset=1000)
+
+
+def test_missing_columns_raise(validator, roster):
+    with pytest.raises(ValueError, match="Missing columns: Age, Gender"):
+        validator.check_frame(roster.drop(columns=["Gender", "Age"]))
+
+
+def test_format_errors_truncates_long_reports(validator, roster):
+    bad = roster.copy()
+    bad["Age"] = 5
+    errors = validator.check_frame(bad)
+    text = format_errors(errors)
+    assert text.startswith("30 invalid row(s): row 0: Age 5 is outside 18-65; ")
+    assert text.count("; row ") == MAX_REPORTED - 1
+    assert text.endswith(f"... and {len(bad) - MAX_REPORTED} more")
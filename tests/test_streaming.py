@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+from src.prediction import score_frame, synthetic_roster
+from src.streaming import stream_score
+
+
+@pytest.fixture(scope="module")
+def roster(models):
+    return synthetic_roster(2500, models, seed=31)
+
+
+def read(path):
+    return pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+
+
+@pytest.mark.parametrize("ext", ["csv", "parquet"])
+def test_chunked_stream_matches_score_frame(models, roster, tmp_path, ext):
+    src, dst = str(tmp_path / f"roster.{ext}"), str(tmp_path / f"scored.{ext}")
+    if ext == "csv":
+        roster.to_csv(src, index=False)
+    else:
+        roster.to_parquet(src, index=False)
+    chunks = []
+    rows = stream_score(src, dst, models, chunk_size=1000, progress=chunks.append)
+    assert rows == len(roster) and chunks == [1000, 2000, 2500]
+    pd.testing.assert_frame_equal(read(dst), score_frame(read(src), models))
+
+
+def test_bad_row_in_later_chunk_removes_output(models, roster, tmp_path):
+    bad = roster.copy()
+    bad.loc[2100, "Age"] = 5
+    src, dst = tmp_path / "roster.csv", tmp_path / "scored.csv"
+    bad.to_csv(src, index=False)
+    with pytest.raises(ValueError, match="row 2100: Age 5 is outside 18-65"):
+        stream_score(str(src), str(dst), models, chunk_size=1000)
+    assert not dst.exists()